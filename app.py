@@ -1,21 +1,28 @@
 import hashlib, json, os
-from scripts.build_index import build_index
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from scripts.build_index import build_index, parse_date
+from scripts.day_files import write_day
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any  # <-- use typing for 3.8
-import feedparser
-from bs4 import BeautifulSoup
-from dateutil import parser as dtparse
+from typing import Optional, List, Dict, Any, Set  # <-- use typing for 3.8
 import yaml
-from parsers import get_parser, FeedContext
+from parsers import get_parser, FeedContext, NewsEntry, FEED_META
 
 try:
     from zoneinfo import ZoneInfo  # python >= 3.9
 except ImportError:
     from backports.zoneinfo import ZoneInfo  # python < 3.9
 
+try:
+    import orjson  # fast JSON encode/decode
+except ImportError:
+    orjson = None
+
 OUTPUT_DIR = Path("docs/news")
+FEED_META_PATH = Path("docs/feed_meta.json")  # ETag / Last-Modified per feed URL
 TIMEZONE = ZoneInfo("Asia/Ho_Chi_Minh")
+# Feed fetches overlap on I/O and lxml drops the GIL while parsing, so threads scale here
+MAX_WORKERS = int(os.environ.get("CRAWL_NEWS_WORKERS") or 8)
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 def load_config(path: Path) -> List[Dict[str, Any]]:
@@ -23,34 +30,10 @@ def load_config(path: Path) -> List[Dict[str, Any]]:
         cfg = yaml.safe_load(f) or {}
     return cfg.get("sources", [])
 
-def parse_ts(entry: Dict[str, Any]) -> datetime:
-    for key in ("published", "pubDate", "updated"):
-        v = entry.get(key)
-        if v:
-            try:
-                return dtparse.parse(v).astimezone(timezone.utc)
-            except Exception:
-                pass
-    for key in ("published_parsed", "updated_parsed"):
-        st = entry.get(key)
-        if st:
-            try:
-                return datetime(*st[:6], tzinfo=timezone.utc)
-            except Exception:
-                pass
-    return datetime.now(TIMEZONE)
-
-def image_from_description(desc: Optional[str]) -> Optional[str]:
-    if not desc:
-        return None
-    soup = BeautifulSoup(desc, "lxml")
-    img = soup.find("img")
-    return img["src"].strip() if img and img.get("src") else None
-
 def get_date_filename(date: datetime) -> Path:
     return OUTPUT_DIR / f"{date.strftime('%m-%d-%Y')}.json"
 
-def load_day(path: Path) -> Dict[str, Dict[str, Any]]:
+def load_feed_meta(path: Path) -> Dict[str, Dict[str, str]]:
     if not path.exists():
         return {}
     try:
@@ -59,26 +42,60 @@ def load_day(path: Path) -> Dict[str, Dict[str, Any]]:
         data = {}
     return data if isinstance(data, dict) else {}
 
+def save_feed_meta(path: Path, data: Dict[str, Dict[str, str]]) -> None:
+    text = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True)
+    # all-304 crawls leave the validators as they were; don't touch the file (or the git tree)
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+def load_day(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    try:
+        raw = path.read_bytes()
+        data = orjson.loads(raw) if orjson else json.loads(raw.decode("utf-8"))
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
+        data = {}
+    return data if isinstance(data, dict) else {}
+
+def load_day_cached(cache: Dict[Path, Dict[str, Dict[str, Any]]], path: Path) -> Dict[str, Dict[str, Any]]:
+    """load_day memoized in `cache` so each date file is read and decoded at most once."""
+    data = cache.get(path)
+    if data is None:
+        data = cache[path] = load_day(path)
+    return data
+
+def load_seen_ids(cache: Dict[Path, Dict[str, Dict[str, Any]]]) -> Set[str]:
+    """Load every date file once into `cache` and return the union of their item_ids."""
+    seen: Set[str] = set()
+    for path in OUTPUT_DIR.glob("*.json"):
+        try:
+            parse_date(path.stem)  # skip index.json / digest files
+        except ValueError:
+            continue
+        seen.update(load_day_cached(cache, path))
+    return seen
+
 def save_day(path: Path, data: Dict[str, Dict[str, Any]]) -> None:
-    items = list(data.values())
-    items.sort(key=lambda x: x.get("published", ""), reverse=True)
-    path.write_text(
-        json.dumps({i["item_id"]: i for i in items}, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8"
-    )
+    # Day files are loaded in stored (newest-first) order and new items are appended, so
+    # Timsort sees a few long runs and this is close to linear; one flush per date per crawl.
+    write_day(path, sorted(data.values(), key=lambda x: x.get("published", ""), reverse=True))
 
 def sha1(s: str) -> str:
     return hashlib.sha1(s.encode("utf-8")).hexdigest()
 
-def clean_html_text(html: str) -> str:
-    """Remove HTML tags from text and clean up whitespace."""
-    if not html:
-        return ""
-    # Use BeautifulSoup to remove HTML tags
-    soup = BeautifulSoup(html, 'html.parser')
-    text = soup.get_text(separator=' ', strip=True)
-    # Clean up multiple spaces and newlines
-    return ' '.join(text.split())
+def item_hash(s: str) -> str:
+    """item_id for new items: 128-bit BLAKE2b (32 hex chars); older files use 40-hex sha1."""
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=16).hexdigest()
+
+def fetch_feed(source: str, source_type: str, url: str, limit: Optional[int] = None) -> List[NewsEntry]:
+    """Fetch and parse a single feed URL (at most `limit` entries); runs inside a worker thread."""
+    parser = get_parser(source_type)
+    ctx = FeedContext(source=source, source_type=source_type)
+    return list(parser.parse(url, ctx, limit))
 
 def crawl(config_path: str = "config.yaml", force: bool = False) -> None:
     """
@@ -93,34 +110,68 @@ def crawl(config_path: str = "config.yaml", force: bool = False) -> None:
     updated = 0
     processed_items = 0
 
-    for feed in feeds:
-        source = feed["name"]
-        source_type = feed["type"]
-        urls: List[str] = feed.get("urls", [])
-        for url in urls:
-            parser = get_parser(source_type)
-            ctx = FeedContext(source=source, source_type=source_type)
-
-            for item in parser.parse(url, ctx):
-                guid = (item.get("guid") or item.get("link") or "").strip()
-                link = (item.get("link") or "").strip()
-                title = (item.get("title") or "").strip()
-                summary = item.get("summary") or ""
-                published = item["published"]   # aware datetime
-                image = item.get("image")
-
-                item_id = sha1(guid or link or (source + title + published.isoformat()))
-
-                published_local = published.astimezone(TIMEZONE)
-                date_path = get_date_filename(published_local)
-
-                existing = load_day(date_path)
+    # Per-date buckets are mutated in memory and flushed once at the end
+    days: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+    dirty: Set[Path] = set()
+    # Conditional GET validators; --force refetches every feed in full
+    FEED_META.clear()
+    if not force:
+        FEED_META.update(load_feed_meta(FEED_META_PATH))
+    # Asia/Ho_Chi_Minh has no DST, so one offset lookup serves the whole crawl
+    vn_offset = datetime.now(TIMEZONE).utcoffset()
+    # Cross-date index so dedup is a set lookup, before touching any day file
+    seen_ids = load_seen_ids(days)
+
+    # Flatten (source, source_type, url, limit) so each feed URL can be fetched independently
+    jobs = [
+        (feed["name"], feed["type"], url, feed.get("limit"))
+        for feed in feeds
+        for url in feed.get("urls", [])
+    ]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(fetch_feed, source, source_type, url, limit): (source, url)
+            for source, source_type, url, limit in jobs
+        }
+
+        # Dedup/save stays on the main thread to avoid races on the per-date JSON files
+        for future in as_completed(futures):
+            source, url = futures[future]
+            try:
+                items = future.result()
+            except Exception as e:
+                print(f"Failed to fetch {url}: {e}")
+                FEED_META.pop(url, None)  # nothing stored: refetch in full next crawl, no 304
+                continue
+
+            for item in items:
+                guid = (item.guid or item.link or "").strip()
+                link = (item.link or "").strip()
+                title = (item.title or "").strip()
+                summary = item.summary or ""
+                published = item.published   # aware datetime
+                image = item.image
+
+                key = guid or link or (source + title + published.isoformat())
+                item_id = item_hash(key)
+                if item_id not in seen_ids:
+                    # Items stored before the blake2b switch are keyed by sha1
+                    legacy_id = sha1(key)
+                    if legacy_id in seen_ids:
+                        item_id = legacy_id
+                if item_id in seen_ids and not force:
+                    continue
+
+                # parsers return UTC; shifting by the fixed offset gives the local date
+                date_path = get_date_filename(published + vn_offset)
+
+                existing = load_day_cached(days, date_path)
                 if item_id in existing:
-                    if not force:
-                        continue
                     updated += 1
                 else:
                     added += 1
+                seen_ids.add(item_id)
 
                 existing[item_id] = {
                     "item_id": item_id,
@@ -131,14 +182,17 @@ def crawl(config_path: str = "config.yaml", force: bool = False) -> None:
                     "guid": guid or link,
                     "image": image,
                     "published": published.isoformat(),
-                    "content_html": item.get("content_html") or "",
-                    "content_text": item.get("content_text") or "",
+                    "content_html": item.content_html or "",
+                    "content_text": item.content_text or "",
                 }
-                save_day(date_path, existing)
+                dirty.add(date_path)
                 processed_items += 1
                 if processed_items % 10 == 0:
                     print(f"Processed {processed_items} items...")
 
+    for date_path in dirty:
+        save_day(date_path, days[date_path])
+    save_feed_meta(FEED_META_PATH, FEED_META)
 
     print(f"Crawl completed. Added {added} new items and updated {updated} items across all dates.")
     return added, updated
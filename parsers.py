@@ -2,143 +2,575 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Dict, Any, Optional, List
+from typing import Iterable, Dict, Any, Optional, List, NamedTuple, Tuple
 from datetime import datetime, timezone
+import codecs
 import html
+import html.entities
+import os
 
-import feedparser
-from bs4 import BeautifulSoup
 from dateutil import parser as dtparse
 import re
 
 from datetime import datetime, timezone, timedelta  # add timedelta
 import unicodedata
 
-import requests
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 
-BR_RE = re.compile(r'</?br\s*/?>', flags=re.I)
-VN_TZ = timezone(timedelta(hours=7))
+import requests
+import requests.adapters
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin, urlsplit
+
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from functools import lru_cache
+
+BR_OR_NL_RE = re.compile(r'</?br\s*/?>|\n', flags=re.I | re.ASCII)
+WS_RE = re.compile(r'\s+')
+# src attribute of an <img> tag (not data-src etc.), quoted or bare
+IMG_SRC_RE = re.compile(r'<img\b[^>]*?(?<![\w-])src\s*=\s*["\']?([^"\'\s>]+)', re.I)
+NON_ALNUM_SLASH_RE = re.compile(r"[^a-z0-9/]+")
+META_DATE_PROPS = ("article:published_time", "og:updated_time", "pubdate")
+# CRAWL_NEWS_DEBUG=1 attaches the source feed entry to each item as "raw"
+DEBUG_RAW = os.environ.get("CRAWL_NEWS_DEBUG") == "1"
+VN_OFFSET = timedelta(hours=7)  # Asia/Ho_Chi_Minh, no DST
+VN_TZ = timezone(VN_OFFSET)
+RFC822_FMT = "%a, %d %b %Y %H:%M:%S %z"
+
+# flat-markup fast path for _clean_html_text: a whole tag (quoted attrs may hold '>'),
+# and the constructs whose text lxml drops or treats specially
+TAG_RE = re.compile(r"""<(?:[^<>"']|"[^"]*"|'[^']*')*>""")
+NEEDS_TREE_RE = re.compile(r"<(?:script|style|!|\?)", re.I)
+# XPath compiled once at import; calling these skips per-call XPath compilation
+XP_TEXT = etree.XPath("descendant-or-self::text()[not(ancestor::script or ancestor::style)]")
+XP_IMG_SRC = etree.XPath("string(descendant-or-self::img/@src)")
+XP_HREFS = etree.XPath("descendant::a/@href", smart_strings=False)  # plain str, no parent refs
+XP_FIRST_H1 = etree.XPath("(descendant::h1)[1]")
+XP_TIME_DATETIME = etree.XPath("string((descendant::time/@datetime)[1])")
+XP_FIRST_HREF_A = etree.XPath("(descendant::a[@href])[1]")
 
 # ---------- local utilities (self-contained to avoid circular imports) ----------
 
-def _clean_html_text(html: Optional[str]) -> str:
+def _html_root(html: Optional[str]) -> Optional[etree._Element]:
+    """Parse an HTML fragment with lxml; None when empty or malformed."""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+def _text_of(root: Optional[etree._Element]) -> str:
+    """Visible text of an lxml tree (script/style skipped), whitespace collapsed."""
+    if root is None:
+        return ""
+    parts = XP_TEXT(root)
+    return WS_RE.sub(" ", " ".join(parts)).strip()
+
+def _clean_html_text(html_in: Optional[str]) -> str:
     """Remove HTML tags from text and clean up whitespace."""
-    if not html:
+    if not html_in:
         return ""
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text(separator=" ", strip=True)
-    return " ".join(text.split())
+    if "<" not in html_in and "&" not in html_in:
+        return WS_RE.sub(" ", html_in).strip()  # plain text: nothing for lxml to do
+    if not NEEDS_TREE_RE.search(html_in):
+        # flat summary markup: strip tags with a regex instead of building a tree;
+        # a '<' that isn't a whole tag means it's not simple markup after all
+        text = TAG_RE.sub(" ", html_in)
+        if "<" not in text:
+            return WS_RE.sub(" ", html.unescape(text) if "&" in text else text).strip()
+    return _text_of(_html_root(html_in))
 
 def _onecms_summary(html_in: str) -> str:
     if not html_in:
         return ""
-    s = html.unescape(html_in)
-    s = BR_RE.sub('\n', s)
-    # take after the first break
-    tail = s.split('\n', 1)[-1] if '\n' in s else s
+    # take after the first <br> (or the first newline, as before). Find it in the raw
+    # markup and unescape only the tail we keep; when the head has an entity it could
+    # hide an escaped <br>, so fall back to unescaping the whole string first.
+    m = BR_OR_NL_RE.search(html_in)
+    if m and "&" not in html_in[:m.start()]:
+        tail = html_in[m.end():]
+        if "&" in tail:
+            tail = html.unescape(tail)
+    else:
+        s = html.unescape(html_in) if "&" in html_in else html_in
+        m = BR_OR_NL_RE.search(s)
+        tail = s[m.end():] if m else s
+    # stray CDATA terminators leak from some OneCMS feeds; drop them before textifying
+    if "]]>" in tail:
+        tail = tail.replace("]]>", "")
     return _clean_html_text(tail)
 
-def _image_from_html(html: Optional[str]) -> Optional[str]:
-    if not html:
+def _trim_summary(text: str, limit: int = 300) -> str:
+    """Cut to `limit` chars with an ellipsis, without leaving dangling punctuation."""
+    if len(text) <= limit:
+        return text
+    return text[:limit - 3].rstrip(" \t\n\r.,;:") + "..."
+
+def _img_src(root: Optional[etree._Element]) -> Optional[str]:
+    """First <img src> in an lxml tree."""
+    if root is None:
+        return None
+    src = XP_IMG_SRC(root)
+    return src.strip() or None
+
+def _image_from_html(html_in: Optional[str]) -> Optional[str]:
+    """First <img src> from raw markup: a regex scan, with lxml only for <img> tags it misses."""
+    if not html_in:
+        return None
+    m = IMG_SRC_RE.search(html_in)
+    if m:
+        src = m.group(1)
+        return (html.unescape(src) if "&" in src else src).strip() or None
+    if "<img" not in html_in.lower():
         return None
-    soup = BeautifulSoup(html, "lxml")
-    img = soup.find("img")
-    return img.get("src").strip() if (img and img.get("src")) else None
+    return _img_src(_html_root(html_in))
+
+def _css(selector: str) -> CSSSelector:
+    """CSS selector compiled to XPath; build these once at import, not per page."""
+    return CSSSelector(selector)
+
+def _first_p_in(selector: str) -> etree.XPath:
+    """Compiled XPath for the first <p> inside the first element matching `selector`."""
+    return etree.XPath(f"({CSSSelector(selector).path})[1]/descendant::p[1]")
+
+def _first_attr(selector: str, attr: str) -> etree.XPath:
+    """Compiled XPath for `attr` of the first element matching `selector`, as a string ('' if none)."""
+    return etree.XPath(f"string(({CSSSelector(selector).path})[1]/@{attr})")
+
+def _select_one(root: etree._Element, selector: CSSSelector) -> Optional[etree._Element]:
+    found = selector(root)
+    return found[0] if found else None
+
+def _meta_map(root: etree._Element) -> Dict[str, str]:
+    """
+    One pass over <meta> tags -> {property-or-name: stripped content}. First non-empty
+    value per key wins, and property= beats name= for the same key.
+    """
+    props: Dict[str, str] = {}
+    names: Dict[str, str] = {}
+    for m in root.iter("meta"):
+        content = (m.get("content") or "").strip()
+        if not content:
+            continue
+        key = m.get("property")
+        if key:
+            props.setdefault(key, content)
+        key = m.get("name")
+        if key:
+            names.setdefault(key, content)
+    names.update(props)
+    return names
+
+def _extract(html: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Parse once and return (summary text, first image src)."""
+    root = _html_root(html)
+    return _text_of(root), _img_src(root)
 
 def _get_content_html(e: dict) -> Optional[str]:
-    """Feedparser maps <content:encoded> to e['content'][0]['value'] if present."""
-    try:
-        contents = e.get("content") or []
-        if contents and isinstance(contents, list):
-            val = contents[0].get("value")
-            return val if isinstance(val, str) and val.strip() else None
-    except Exception:
-        pass
-    return None
+    """The feed reader maps <content:encoded> to e['content'][0]['value'] if present."""
+    # _entry_from_element only sets "content" to [{"value": <non-empty str>}]; no guards needed
+    contents = e.get("content")
+    return contents[0]["value"] if contents else None
 
 def _first_media_url(e: dict) -> Optional[str]:
     """Try media:content / media:thumbnail arrays first."""
-    media = e.get("media_content") or e.get("media_thumbnail") or []
-    if isinstance(media, list) and media:
-        url = media[0].get("url")
-        return url.strip() if isinstance(url, str) else None
-    return None
+    media = e.get("media_content") or e.get("media_thumbnail")
+    return (media[0]["url"].strip() or None) if media else None
 
 def _to_utc_assume_vn(dt: datetime) -> datetime:
     """Return UTC datetime; if naive, assume Asia/Ho_Chi_Minh (+07:00)."""
     if not isinstance(dt, datetime):
         return datetime.now(timezone.utc)
+    # fixed offset: naive VN wall time -> UTC is one subtraction, no tzinfo round-trip
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=VN_TZ)
+        return dt.replace(tzinfo=timezone.utc) - VN_OFFSET
+    if dt.tzinfo is timezone.utc:
+        return dt
     return dt.astimezone(timezone.utc)
 
+@lru_cache(maxsize=4096)
+def _dtparse(v: str, dayfirst: bool = False) -> datetime:
+    """dateutil parse, memoized; the result may be naive. Pages repeat the same stamps."""
+    if not dayfirst and v[:4].isdigit():
+        # ISO 8601 (Atom, article:published_time) via the C fast path
+        try:
+            return datetime.fromisoformat(v.strip())
+        except ValueError:
+            pass
+    return dtparse.parse(v, dayfirst=dayfirst)
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(v: str) -> datetime:
+    """Timestamp string -> UTC (naive = VN time); RFC-822 via strptime, else dateutil.
+    Cached: feeds repeat the same timestamps across items and polls. Raises if unparseable."""
+    try:
+        dt = datetime.strptime(v.strip(), RFC822_FMT)
+    except ValueError:
+        dt = _dtparse(v)
+    return _to_utc_assume_vn(dt)
+
 def _parse_ts(entry: Dict[str, Any]) -> datetime:
     for key in ("published", "pubDate", "updated"):
         v = entry.get(key)
         if v:
             try:
-                dt = dtparse.parse(v)
-                return _to_utc_assume_vn(dt)   # << use helper
-            except Exception:
-                pass
-    for key in ("published_parsed", "updated_parsed"):
-        st = entry.get(key)
-        if st:
-            try:
-                dt = datetime(*st[:6])
-                return _to_utc_assume_vn(dt)   # << use helper
+                return _parse_date_str(v)
             except Exception:
                 pass
     return datetime.now(timezone.utc)
 
+# feed/listing url -> {"etag": ..., "modified": ...}; loaded/saved by the crawler around a run
+FEED_META: Dict[str, Dict[str, str]] = {}
+
+def _remember_validators(url: str, etag: Optional[str], modified: Optional[str]) -> None:
+    validators = {k: v for k, v in (("etag", etag), ("modified", modified)) if v}
+    if validators:
+        FEED_META[url] = validators
+    else:
+        FEED_META.pop(url, None)
+
+# ---------- HTTP ----------
+
+HTTP_POOL_SIZE = 32  # keep-alive connections kept per host
+
+def _make_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Keep-alive session shared by the crawler threads; reuses TCP/TLS connections per host."""
+    session = requests.Session()
+    # a couple of quick retries on resets/5xx beat dropping a feed until the next crawl
+    retry = Retry(
+        total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",), raise_on_status=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+HTTP = _make_session()
+MAX_PAGE_BYTES = 5_000_000  # article/listing pages are ~100-500 KB
+
+CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+def _header_charset(r: requests.Response) -> Optional[str]:
+    """Charset declared in Content-Type, if any (no ISO-8859-1 default, no content sniffing)."""
+    m = CHARSET_RE.search(r.headers.get("Content-Type", ""))
+    return m.group(1) if m else None
+
+def _origin(base_url: str) -> str:
+    """scheme://host of a page URL, for resolving root-relative links."""
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def _abs_url(href: str, base_url: str, origin: str) -> str:
+    """urljoin with string fast paths for the common absolute and root-relative hrefs."""
+    if href.startswith("/") and not href.startswith("//") and "/." not in href:
+        return origin + href
+    if href.startswith(("http://", "https://")):
+        return href
+    return urljoin(base_url, href)
+
+def _conditional_headers(url: str, headers: Dict[str, str]) -> Dict[str, str]:
+    """`headers` plus If-None-Match / If-Modified-Since from the validators stored for `url`."""
+    meta = FEED_META.get(url, {})
+    headers = dict(headers)
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("modified"):
+        headers["If-Modified-Since"] = meta["modified"]
+    return headers
+
+def _fetch_page(
+    url: str, headers: Dict[str, str], timeout: int, conditional: bool = False
+) -> Optional[Tuple[bytes, Optional[str]]]:
+    """
+    GET a page as raw bytes + declared charset; refuse bodies over MAX_PAGE_BYTES.
+    With `conditional`, send stored validators and return None on 304 Not Modified;
+    callers drop the new validators again if what the page links to can't be fetched.
+    """
+    if conditional:
+        headers = _conditional_headers(url, headers)
+    r = HTTP.get(url, headers=headers, timeout=timeout)
+    if conditional and r.status_code == 304:
+        return None
+    r.raise_for_status()
+    if len(r.content) > MAX_PAGE_BYTES:
+        raise ValueError(f"page too large ({len(r.content)} bytes)")
+    if conditional:
+        _remember_validators(url, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+    return r.content, _header_charset(r)
+
+@lru_cache(maxsize=64)
+def _known_encoding(label: Optional[str]) -> Optional[str]:
+    """Python's canonical name for a charset label, or None when it is unknown (e.g. "utf8mb4")."""
+    if not label:
+        return None
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+def _parse_html_bytes(content: bytes, encoding: Optional[str] = None) -> etree._Element:
+    """
+    Parse raw page bytes with lxml, decoding with the HTTP charset, else the page's
+    <meta charset>, else UTF-8 -- requests' charset detector (r.text) never runs.
+    Unknown labels are skipped rather than failing the page; libxml2 recovers bad bytes.
+    """
+    encoding = _known_encoding(encoding)
+    if not encoding:
+        m = META_CHARSET_RE.search(content, 0, 4096)
+        encoding = _known_encoding(m.group(1).decode("ascii")) if m else None
+    try:
+        parser = lxml.html.HTMLParser(encoding=encoding or "utf-8")
+    except LookupError:  # a name Python knows but libxml2/iconv doesn't
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+    return lxml.html.fromstring(content, parser=parser)
+
+# ---------- lxml feed reader ----------
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+MEDIA_NS = "http://search.yahoo.com/mrss/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+RSS1_NS = "http://purl.org/rss/1.0/"  # RSS 1.0 (RDF): items and their fields are namespaced
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+
+# Clark-notation tags built once; _entry_from_element runs per item
+ATOM_ENTRY = f"{{{ATOM_NS}}}entry"
+ATOM_LINK = f"{{{ATOM_NS}}}link"
+RSS1_ITEM = f"{{{RSS1_NS}}}item"
+RDF_ABOUT = f"{{{RDF_NS}}}about"
+ID_PATHS = ("guid", f"{{{ATOM_NS}}}id")
+LINK_PATHS = ("link", f"{{{RSS1_NS}}}link")
+TITLE_PATHS = ("title", f"{{{ATOM_NS}}}title", f"{{{RSS1_NS}}}title")
+SUMMARY_PATHS = ("description", f"{{{ATOM_NS}}}summary", f"{{{RSS1_NS}}}description")
+PUBLISHED_PATHS = ("pubDate", f"{{{ATOM_NS}}}published", f"{{{DC_NS}}}date")
+UPDATED_PATHS = (f"{{{ATOM_NS}}}updated",)
+CONTENT_PATHS = (f"{{{CONTENT_NS}}}encoded", f"{{{ATOM_NS}}}content")
+MEDIA_TAGS = (("media_content", f"{{{MEDIA_NS}}}content"), ("media_thumbnail", f"{{{MEDIA_NS}}}thumbnail"))
+
+def _findtext(el: etree._Element, *paths: str) -> Optional[str]:
+    """First non-empty text among `paths`, stripped once here so parsers don't have to."""
+    for path in paths:
+        v = el.findtext(path)
+        if v:
+            v = v.strip()
+            if v:
+                return v
+    return None
+
+def _atom_link(el: etree._Element) -> Optional[str]:
+    for link in el.iterfind(ATOM_LINK):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return None
+
+def _entry_from_element(el: etree._Element) -> Dict[str, Any]:
+    """
+    Map an RSS <item> / Atom <entry> to feedparser-style entry keys (summary, content, media_*).
+    Text values are already stripped (see _findtext), so parsers use them as they are;
+    parse() methods bind `get = e.get` once per entry since they read several keys.
+    """
+    entry: Dict[str, Any] = {
+        "id": _findtext(el, *ID_PATHS) or el.get(RDF_ABOUT),
+        "link": _findtext(el, *LINK_PATHS) or _atom_link(el),
+        "title": _findtext(el, *TITLE_PATHS),
+        "summary": _findtext(el, *SUMMARY_PATHS),
+        "published": _findtext(el, *PUBLISHED_PATHS),
+        "updated": _findtext(el, *UPDATED_PATHS),
+    }
+    content = _findtext(el, *CONTENT_PATHS)
+    if content:
+        entry["content"] = [{"value": content}]
+    for key, tag in MEDIA_TAGS:
+        urls = [m.get("url") for m in el.iterfind(tag) if m.get("url")]
+        if urls:
+            entry[key] = [{"url": u} for u in urls]
+    return entry
+
+# Feeds routinely use HTML named entities (&nbsp;, &ndash;) and bare '&' outside CDATA.
+# Neither is well-formed XML, and libxml2 in recover mode cuts the text at that point
+# ("AT&T mua lại" -> "AT"), so they are rewritten into XML the parser understands.
+XML_ENTITIES = frozenset((b"amp", b"lt", b"gt", b"quot", b"apos"))
+HTML_ENTITY_REFS = {
+    name[:-1].encode("ascii"): "".join(f"&#{ord(c)};" for c in chars).encode("ascii")
+    for name, chars in html.entities.html5.items() if name.endswith(";")
+}
+AMP_RE = re.compile(rb"&(?:(#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]{0,31});)?")
+CDATA_OPEN = b"<![CDATA["
+CDATA_CLOSE = b"]]>"
+
+def _fix_entity_ref(m: "re.Match[bytes]") -> bytes:
+    ref = m.group(1)
+    if ref is None:
+        return b"&amp;"  # bare '&'
+    if ref[:1] == b"#" or ref in XML_ENTITIES:
+        return m.group(0)
+    return HTML_ENTITY_REFS.get(ref, b"&amp;" + ref + b";")  # unknown name: keep it as text
+
+class _EntityFixingReader:
+    """
+    File-like wrapper handed to iterparse: rewrites HTML entities to numeric references
+    and escapes bare '&', leaving CDATA sections alone. Works on the byte stream, so it
+    assumes an ASCII-compatible encoding; UTF-16 feeds (BOM) pass through untouched.
+    """
+    __slots__ = ("_raw", "_buf", "_in_cdata", "_eof", "_passthrough")
+
+    def __init__(self, raw: Any) -> None:
+        self._raw = raw
+        self._buf = b""  # tail held back because it may continue in the next chunk
+        self._in_cdata = False
+        self._eof = False
+        self._passthrough: Optional[bool] = None
+
+    def read(self, size: int = 65536) -> bytes:
+        while not self._eof:
+            chunk = self._raw.read(size if size and size > 0 else 65536)
+            if self._passthrough is None:
+                self._passthrough = chunk[:2] in (b"\xff\xfe", b"\xfe\xff")
+            if self._passthrough:
+                return chunk
+            if not chunk:
+                self._eof = True
+            out = self._fix(self._buf + chunk)
+            if out:
+                return out
+        return b""
+
+    def _fix(self, data: bytes) -> bytes:
+        out = []
+        pos, n = 0, len(data)
+        while pos < n:
+            if self._in_cdata:
+                end = data.find(CDATA_CLOSE, pos)
+                if end < 0:
+                    cut = n if self._eof else max(pos, n - 2)  # "]]>" may be split
+                    out.append(data[pos:cut])
+                    pos = cut
+                    break
+                out.append(data[pos:end + 3])
+                pos, self._in_cdata = end + 3, False
+                continue
+            start = data.find(CDATA_OPEN, pos)
+            if start >= 0:
+                out.append(AMP_RE.sub(_fix_entity_ref, data[pos:start]))
+                out.append(CDATA_OPEN)
+                pos, self._in_cdata = start + len(CDATA_OPEN), True
+                continue
+            cut = n
+            if not self._eof:
+                # hold back a possible start of "<![CDATA[" or an unfinished "&name;"
+                lt = data.rfind(b"<", max(pos, n - len(CDATA_OPEN) + 1))
+                if lt >= 0 and CDATA_OPEN.startswith(data[lt:]):
+                    cut = lt
+                amp = data.rfind(b"&", max(pos, cut - 34), cut)
+                if amp >= 0 and b";" not in data[amp:cut]:
+                    cut = amp
+            out.append(AMP_RE.sub(_fix_entity_ref, data[pos:cut]))
+            pos = cut
+            break
+        self._buf = data[pos:]
+        return b"".join(out)
+
+def _read_feed_entries(stream: Any) -> Iterable[Dict[str, Any]]:
+    """Entry dicts for each RSS 2.0 / RSS 1.0 <item> and Atom <entry> in a byte stream."""
+    for _, el in etree.iterparse(
+        _EntityFixingReader(stream), events=("end",), tag=("item", RSS1_ITEM, ATOM_ENTRY),
+        recover=True, resolve_entities=False, no_network=True,
+        remove_comments=True, remove_pis=True,  # never read; don't build nodes for them
+    ):
+        yield _entry_from_element(el)
+        # keep memory flat: drop the finished item and any siblings before it
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+def _iter_feed_entries(url: str, limit: Optional[int] = None, timeout: int = 15) -> Iterable[Dict[str, Any]]:
+    """
+    Stream an RSS/Atom feed through lxml iterparse, yielding at most `limit` entry dicts,
+    one per <item>/<entry>; reading stops once `limit` are out. Sends a conditional GET;
+    a 304 yields nothing. New validators are stored only after the read completes.
+    """
+    headers = _conditional_headers(url, {"User-Agent": "Mozilla/5.0 (compatible; crawl-news/1.0)"})
+
+    with HTTP.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        if r.status_code == 304:
+            return
+        r.raise_for_status()
+        r.raw.decode_content = True  # undo gzip/deflate transfer encoding
+        yield from islice(_read_feed_entries(r.raw), limit)
+    # only now: a read that failed midway must not turn the next crawl into a 304
+    _remember_validators(url, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+
 # ---------- parser classes ----------
 
-@dataclass
+@dataclass(frozen=True)
 class FeedContext:
+    # explicit __slots__ rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("source", "source_type")
     source: str
     source_type: str
 
+class NewsEntry(NamedTuple):
+    """One parsed article. A tuple, not a dict: one allocation per entry, no per-key hashing."""
+    guid: str
+    link: str
+    title: str
+    summary: str
+    published: datetime         # aware datetime (UTC)
+    image: Optional[str]
+    content_html: Optional[str] = None  # HTML scrapers, special titles only
+    content_text: Optional[str] = None
+    raw: Optional[Dict[str, Any]] = None  # full feed entry under CRAWL_NEWS_DEBUG=1
+
 class BaseParser:
-    def parse(self, url: str, ctx: FeedContext) -> Iterable[Dict[str, Any]]:
+    __slots__ = ()  # parsers hold no per-instance state; see PARSER_REGISTRY
+
+    def parse(self, url: str, ctx: FeedContext, limit: Optional[int] = None) -> Iterable[NewsEntry]:
         raise NotImplementedError
 
 class GenericRSSParser(BaseParser):
-    """Default parser for standard RSS/Atom feeds."""
-    def parse(self, url: str, ctx: FeedContext) -> Iterable[Dict[str, Any]]:
-        parsed = feedparser.parse(url)
-        for e in parsed.entries:
-            guid = (e.get("id") or e.get("guid") or e.get("link") or "").strip()
-            link = (e.get("link") or "").strip()
-            title = (e.get("title") or "").strip()
-
-            # prefer <summary> then <description>
-            desc_html = e.get("summary") or e.get("description")
-            summary = _clean_html_text(desc_html) if desc_html else ""
+    """Default parser for standard RSS/Atom feeds, streamed with lxml."""
+    __slots__ = ()
+
+    def parse(self, url: str, ctx: FeedContext, limit: Optional[int] = None) -> Iterable[NewsEntry]:
+        for e in _iter_feed_entries(url, limit):
+            get = e.get
+            link = get("link") or ""
+            title = get("title") or ""
+            guid = get("id") or get("guid") or link
+
+            # prefer <summary> then <description>; one parse yields text + <img>
+            desc_html = get("summary") or get("description")
+            summary, desc_image = _extract(desc_html)
 
             published = _parse_ts(e)
 
             # image: media:* > first <img> in description
-            image = _first_media_url(e)
-            if not image and desc_html:
-                image = _image_from_html(desc_html)
-
-            yield {
-                "guid": guid,
-                "link": link,
-                "title": title,
-                "summary": summary,
-                "published": published,   # aware datetime (UTC)
-                "image": image,
-                "raw": e,                 # optional for debugging
-            }
+            image = _first_media_url(e) or desc_image
+
+            yield NewsEntry(
+                guid=guid,
+                link=link,
+                title=title,
+                summary=summary,
+                published=published,   # aware datetime (UTC)
+                image=image,
+                raw=e if DEBUG_RAW else None,  # full feed entry; pins a lot of memory
+            )
 
 class VietstockParser(GenericRSSParser):
     """
     Vietstock puts a thumbnail <img> inside <description>.
     GenericRSSParser already covers this behavior, so no extra work needed.
     """
-    pass
+    __slots__ = ()
 
 class MarketTimesParser(BaseParser):
     """
@@ -149,37 +581,41 @@ class MarketTimesParser(BaseParser):
       - summary: prefer <description>; else textify <content:encoded>
       - image: media:* > <img> in content:encoded > <img> in description
     """
-    def parse(self, url: str, ctx: FeedContext) -> Iterable[Dict[str, Any]]:
-        parsed = feedparser.parse(url)
-        for e in parsed.entries:
-            guid = (e.get("guid") or e.get("id") or e.get("link") or "").strip()
-            link = (e.get("link") or "").strip()
-            title = (e.get("title") or "").strip()
+    __slots__ = ()
+
+    def parse(self, url: str, ctx: FeedContext, limit: Optional[int] = None) -> Iterable[NewsEntry]:
+        for e in _iter_feed_entries(url, limit):
+            get = e.get
+            link = get("link") or ""
+            title = get("title") or ""
+            guid = get("guid") or get("id") or link
 
             content_html = _get_content_html(e)
-            desc_html = e.get("summary") or e.get("description")
+            desc_html = get("summary") or get("description")
+            if content_html == desc_html:
+                content_html = None  # same blob in both fields; parse it once
+
+            # parse the description once; content:encoded is only parsed when it
+            # feeds the summary -- its image comes from a regex scan
+            desc_root = _html_root(desc_html)
 
             # summary
-            summary = _clean_html_text(desc_html) if desc_html else _clean_html_text(content_html)
+            summary = _text_of(desc_root) if desc_html else _clean_html_text(content_html)
 
             published = _parse_ts(e)
 
             # image
-            image = _first_media_url(e)
-            if not image and content_html:
-                image = _image_from_html(content_html)
-            if not image and desc_html:
-                image = _image_from_html(desc_html)
-
-            yield {
-                "guid": guid,
-                "link": link,
-                "title": title,
-                "summary": summary,
-                "published": published,
-                "image": image,
-                "raw": e,
-            }
+            image = _first_media_url(e) or _image_from_html(content_html) or _img_src(desc_root)
+
+            yield NewsEntry(
+                guid=guid,
+                link=link,
+                title=title,
+                summary=summary,
+                published=published,
+                image=image,
+                raw=e if DEBUG_RAW else None,
+            )
 
 class NguoiQuanSatParser(BaseParser):
     """
@@ -191,21 +627,22 @@ class NguoiQuanSatParser(BaseParser):
                  then trim to a concise blurb.
       - image: media:* > <img> in description > <img> in content:encoded
     """
-    def parse(self, url: str, ctx: FeedContext) -> Iterable[Dict[str, Any]]:
-        parsed = feedparser.parse(url, sanitize_html=False, resolve_relative_uris=False)
-        for e in parsed.entries:
-            guid = (e.get("guid") or e.get("id") or e.get("link") or "").strip()
-            link = (e.get("link") or "").strip()
-            title = (e.get("title") or "").strip()
+    __slots__ = ()
+
+    def parse(self, url: str, ctx: FeedContext, limit: Optional[int] = None) -> Iterable[NewsEntry]:
+        for e in _iter_feed_entries(url, limit):
+            get = e.get
+            link = get("link") or ""
+            title = get("title") or ""
+            guid = get("guid") or get("id") or link
 
             content_html = _get_content_html(e)
-            desc_html = e.get("summary") or e.get("description")
+            desc_html = get("summary") or get("description")
+            if content_html == desc_html:
+                content_html = None
 
             summary_src = desc_html or content_html
-            summary_text = _onecms_summary(summary_src)  # or _clean_html_text(summary_src)
-            if len(summary_text) > 300:
-                summary_text = summary_text[:297].rstrip() + "..."
-            summary_text = summary_text.replace("]]>", "")
+            summary_text = _trim_summary(_onecms_summary(summary_src))
             
             published = _parse_ts(e)
 
@@ -216,15 +653,15 @@ class NguoiQuanSatParser(BaseParser):
             if not image and content_html:
                 image = _image_from_html(content_html)
 
-            yield {
-                "guid": guid,
-                "link": link,
-                "title": title,
-                "summary": summary_text,
-                "published": published,
-                "image": image,
-                "raw": e,
-            }
+            yield NewsEntry(
+                guid=guid,
+                link=link,
+                title=title,
+                summary=summary_text,
+                published=published,
+                image=image,
+                raw=e if DEBUG_RAW else None,
+            )
 
 class VnExpressParser(BaseParser):
     """
@@ -236,21 +673,22 @@ class VnExpressParser(BaseParser):
                  then trim to a concise blurb.
       - image: media:* > <img> in description > <img> in content:encoded
     """
-    def parse(self, url: str, ctx: FeedContext) -> Iterable[Dict[str, Any]]:
-        parsed = feedparser.parse(url, sanitize_html=False, resolve_relative_uris=False)
-        for e in parsed.entries:
-            guid = (e.get("guid") or e.get("id") or e.get("link") or "").strip()
-            link = (e.get("link") or "").strip()
-            title = (e.get("title") or "").strip()
+    __slots__ = ()
+
+    def parse(self, url: str, ctx: FeedContext, limit: Optional[int] = None) -> Iterable[NewsEntry]:
+        for e in _iter_feed_entries(url, limit):
+            get = e.get
+            link = get("link") or ""
+            title = get("title") or ""
+            guid = get("guid") or get("id") or link
 
             content_html = _get_content_html(e)
-            desc_html = e.get("summary") or e.get("description")
+            desc_html = get("summary") or get("description")
+            if content_html == desc_html:
+                content_html = None
 
             summary_src = desc_html or content_html
-            summary_text = _onecms_summary(summary_src)  # or _clean_html_text(summary_src)
-            if len(summary_text) > 300:
-                summary_text = summary_text[:297].rstrip() + "..."
-            summary_text = summary_text.replace("]]>", "")
+            summary_text = _trim_summary(_onecms_summary(summary_src))
             
             published = _parse_ts(e)
 
@@ -261,15 +699,15 @@ class VnExpressParser(BaseParser):
             if not image and content_html:
                 image = _image_from_html(content_html)
 
-            yield {
-                "guid": guid,
-                "link": link,
-                "title": title,
-                "summary": summary_text,
-                "published": published,
-                "image": image,
-                "raw": e,
-            }
+            yield NewsEntry(
+                guid=guid,
+                link=link,
+                title=title,
+                summary=summary_text,
+                published=published,
+                image=image,
+                raw=e if DEBUG_RAW else None,
+            )
 
 class TinNhanhChungKhoanHTMLParser(BaseParser):
     """
@@ -278,12 +716,15 @@ class TinNhanhChungKhoanHTMLParser(BaseParser):
     If the title matches a “special” pattern (e.g. 'Sự kiện chứng khoán đáng chú ý ngày dd/mm'),
     also include content_html/content_text.
     """
+    __slots__ = ()
 
-    # Accept normal & mobile domains; accept article pages and (optionally) event pages
+    # Accept normal & mobile domains; accept article pages and (optionally) event pages.
+    # Applied with fullmatch to the normalized href, so no ^/$ anchors.
     ARTICLE_RE = re.compile(
-        r"^https?://(?:www\.|m\.)?tinnhanhchungkhoan\.vn/(?:.+-post\d+\.html|event/.+-\d+\.html)$",
+        r"https?://(?:www\.|m\.)?tinnhanhchungkhoan\.vn/(?:.+-post\d+\.html|event/.+-\d+\.html)",
         re.IGNORECASE,
     )
+    ARTICLE_SUFFIX = ".html"  # cheap prefilter before ARTICLE_RE; nav/ads links rarely match
 
     # --- Special title detection (extendable) ---
     SPECIAL_TITLE_PHRASES = [
@@ -298,13 +739,32 @@ class TinNhanhChungKhoanHTMLParser(BaseParser):
     ]
     DATE_RE = re.compile(r"\b\d{1,2}/\d{1,2}(?:/\d{4})?\b")
 
+    # One article pool per site, shared by all of its listing pages: however many listings
+    # the crawl runs at once, the host sees at most ARTICLE_WORKERS article requests, which
+    # together with the listings (one per crawl worker) stays within HTTP_POOL_SIZE connections
+    ARTICLE_WORKERS = 16
+    ARTICLE_POOL = ThreadPoolExecutor(max_workers=ARTICLE_WORKERS, thread_name_prefix="tnck-article")
+
+    # --- Selectors / patterns compiled once (order = priority) ---
+    MAIN_COLUMN = _css("div.main-column")
+    # first <p> of each article body container; one XPath call per container
+    FIRST_PARAGRAPH = tuple(_first_p_in(sel) for sel in (
+        "div.detail-content", "div.content-detail", "div.article__content",
+        "div.main-article", "div#contentdetail", "article",
+    ))
+    IMAGE_SRC = _first_attr("div.detail-content img, article img, div.main-article img", "src")
+    FULL_BODY_CONTAINERS = (_css("div.article__body"),)
+    NOISE_SELECTOR = _css(
+        "script, style, .social-share, .related, .related-news, .tags, .tag, .author, .fb_iframe_widget"
+    )
+    VISIBLE_DATE_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}")
+
     # --- Helpers ---
     @staticmethod
     def _fold(s: str) -> str:
         """Lowercase & remove Vietnamese accents."""
         if not s:
             return ""
-        import unicodedata
         s = unicodedata.normalize("NFD", s)
         s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
         return s.lower()
@@ -313,8 +773,8 @@ class TinNhanhChungKhoanHTMLParser(BaseParser):
     def _norm_letters_digits_slash(cls, s: str) -> str:
         """Fold, then reduce to letters/digits/slash; collapse spaces."""
         f = cls._fold(s)
-        f = re.sub(r"[^a-z0-9/]+", " ", f)
-        return re.sub(r"\s+", " ", f).strip()
+        f = NON_ALNUM_SLASH_RE.sub(" ", f)
+        return WS_RE.sub(" ", f).strip()
 
     @classmethod
     def _is_special_title(cls, title: str) -> bool:
@@ -326,352 +786,369 @@ class TinNhanhChungKhoanHTMLParser(BaseParser):
     @staticmethod
     def _normalize_href(href: str) -> str:
         """Strip query/hash and all whitespace (incl. zero-width)."""
-        href = href.split("?", 1)[0].split("#", 1)[0]
+        href = href.partition("?")[0].partition("#")[0]
         return "".join(href.split())
 
-    @staticmethod
-    def _to_utc_assume_vn(dt: datetime) -> datetime:
-        """Convert to UTC; if naive, assume Asia/Ho_Chi_Minh (+07)."""
-        from datetime import timedelta
-        VN_TZ = timezone(timedelta(hours=7))
-        if not isinstance(dt, datetime):
-            return datetime.now(timezone.utc)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=VN_TZ)
-        return dt.astimezone(timezone.utc)
-
-    def _fetch(self, url: str, timeout: int = 15) -> str:
+    def _fetch(self, url: str, timeout: int = 15, conditional: bool = False) -> Optional[Tuple[bytes, Optional[str]]]:
         headers = {"User-Agent": "Mozilla/5.0 (compatible; tnck-crawler/1.0)"}
-        r = requests.get(url, headers=headers, timeout=timeout)
-        r.raise_for_status()
-        return r.text
+        return _fetch_page(url, headers, timeout, conditional)
+
+    def _resolve_article_urls(self, root: etree._Element, base_url: str) -> List[str]:
+        """Article URLs in listing (document) order, first occurrence kept, so `limit` takes the newest."""
+        links: Dict[str, None] = {}  # insertion-ordered set
 
-    def _resolve_article_urls(self, list_html: str, base_url: str) -> List[str]:
-        soup = BeautifulSoup(list_html, "lxml")
-        links = set()
+        origin = _origin(base_url)
 
         # 🔒 Restrict to main content area
-        main_col = soup.select_one("div.main-column")
-        if not main_col:
+        main_col = _select_one(root, self.MAIN_COLUMN)
+        if main_col is None:
             return []
 
-        for a in main_col.select("a[href]"):
-            href = urljoin(base_url, a["href"])
+        # the same article is usually linked from image + title + teaser; resolve each href once
+        for href in dict.fromkeys(XP_HREFS(main_col)):
+            href = _abs_url(href, base_url, origin)
             norm = self._normalize_href(href)
-            if self.ARTICLE_RE.search(norm):
-                links.add(norm)
+            if norm[-5:].lower().endswith(self.ARTICLE_SUFFIX) and self.ARTICLE_RE.fullmatch(norm):
+                links[norm] = None
 
-        return sorted(links)
+        return list(links)
 
-    def _first_paragraph(self, soup: BeautifulSoup) -> str:
+    def _first_paragraph(self, root: etree._Element, meta: Dict[str, str]) -> str:
         # Try article body containers; fall back to meta description
-        containers = [
-            "div.detail-content", "div.content-detail", "div.article__content",
-            "div.main-article", "div#contentdetail", "article"
-        ]
-        for sel in containers:
-            node = soup.select_one(sel)
-            if not node:
-                continue
-            p = node.find("p")
+        for xp in self.FIRST_PARAGRAPH:
+            p = xp(root)
             if p:
-                return _clean_html_text(str(p))
-        md = soup.find("meta", attrs={"name": "description"})
-        return (md.get("content", "").strip() if md else "") or ""
+                return _text_of(p[0])
+        return meta.get("description", "")
 
-    def _parse_published(self, soup: BeautifulSoup) -> datetime:
+    def _parse_published(self, root: etree._Element, meta: Dict[str, str]) -> datetime:
         # Prefer meta timestamps; tolerate missing tz by assuming VN time
-        for prop in ("article:published_time", "og:updated_time", "pubdate"):
-            m = soup.find("meta", attrs={"property": prop}) or soup.find("meta", attrs={"name": prop})
-            if m and m.get("content"):
+        for prop in META_DATE_PROPS:
+            content = meta.get(prop)
+            if content:
                 try:
-                    dt = dtparse.parse(m["content"])
-                    return self._to_utc_assume_vn(dt)
+                    return _parse_date_str(content)
                 except Exception:
                     pass
 
         # Try <time datetime="...">
-        t = soup.find("time", attrs={"datetime": True})
-        if t and t.get("datetime"):
+        t = XP_TIME_DATETIME(root)
+        if t:
             try:
-                dt = dtparse.parse(t["datetime"])
-                return self._to_utc_assume_vn(dt)
+                dt = _dtparse(t)
+                return _to_utc_assume_vn(dt)
             except Exception:
                 pass
 
         # Fallback visible time like "30/07/2025 15:46"
-        tnode = soup.find(["time", "span", "div"], string=re.compile(r"\d{1,2}/\d{1,2}/\d{4}"))
-        if tnode:
+        for tnode in root.iter("time", "span", "div"):
+            if len(tnode) or not tnode.text or not self.VISIBLE_DATE_RE.search(tnode.text):
+                continue
             try:
-                dt = dtparse.parse(tnode.get_text(" ", strip=True), dayfirst=True)
-                return self._to_utc_assume_vn(dt)
+                dt = _dtparse(tnode.text.strip(), dayfirst=True)
+                return _to_utc_assume_vn(dt)
             except Exception:
                 pass
+            break
 
         return datetime.now(timezone.utc)
 
-    def _extract_image(self, soup: BeautifulSoup) -> Optional[str]:
-        og = soup.find("meta", attrs={"property": "og:image"})
-        if og and og.get("content"):
-            return og["content"].strip()
-        img = soup.select_one("div.detail-content img, article img, div.main-article img")
-        return (img.get("src").strip() if img and img.get("src") else None)
-
-    def _extract_full_html(self, soup: BeautifulSoup) -> str:
-        """Return cleaned article body HTML (for special titles)."""
-        containers = [
-            "div.article__body"
-        ]
+    def _extract_image(self, root: etree._Element, meta: Dict[str, str]) -> Optional[str]:
+        og = meta.get("og:image")
+        if og:
+            return og
+        return self.IMAGE_SRC(root).strip() or None
+
+    def _extract_body(self, root: etree._Element) -> Optional[etree._Element]:
+        """Return the cleaned article body node (for special titles)."""
         node = None
-        for sel in containers:
-            node = soup.select_one(sel)
-            if node:
+        for sel in self.FULL_BODY_CONTAINERS:
+            node = _select_one(root, sel)
+            if node is not None:
                 break
-        if not node:
-            return ""
+        if node is None:
+            return None
 
         # Remove noise
-        for bad in node.select(
-            "script, style, .social-share, .related, .related-news, .tags, .tag, .author, .fb_iframe_widget"
-        ):
-            bad.decompose()
+        for bad in self.NOISE_SELECTOR(node):
+            bad.drop_tree()
 
-        return str(node)
+        return node
 
-    def parse(self, url: str, ctx: FeedContext) -> Iterable[Dict[str, Any]]:
+    def parse(self, url: str, ctx: FeedContext, limit: Optional[int] = None) -> Iterable[NewsEntry]:
         # 1) Fetch the listing page
         try:
-            listing_html = self._fetch(url)
+            fetched = self._fetch(url, conditional=True)
+            if fetched is None:  # 304: listing unchanged since the last crawl
+                return []
+            listing = _parse_html_bytes(*fetched)
         except Exception as e:
             print(f"[TNCK] list fetch failed: {url} -> {e}")
+            FEED_META.pop(url, None)  # validators may be stored already; a 304 would skip the retry
             return []
 
         # 2) Extract article links
-        article_urls = self._resolve_article_urls(listing_html, url)
-
-        # 3) Visit each article
-        for link in article_urls:
+        article_urls = self._resolve_article_urls(listing, url)[:limit]
+        del listing  # the listing tree is not needed while articles are fetched
+
+        # 3) Fetch articles concurrently; parse each page here as it arrives
+        failed = False
+        pool = self.ARTICLE_POOL  # shared, so no `with`: shutting it down would end other listings' fetches
+        futures = {pool.submit(self._fetch, link): link for link in article_urls}
+        for future in as_completed(futures):
+            link = futures[future]
             try:
-                html = self._fetch(link)
-                soup = BeautifulSoup(html, "lxml")
+                root = _parse_html_bytes(*future.result())
 
+                meta = _meta_map(root)  # every <meta> lookup below is a dict hit
+                h1 = XP_FIRST_H1(root)
                 title = (
-                    (soup.find("meta", attrs={"property": "og:title"}) or {}).get("content")
-                    or (soup.find("h1") or {}).get_text(strip=True)
+                    meta.get("og:title")
+                    or (_text_of(h1[0]) if h1 else "")
                     or ""
                 ).strip()
 
-                summary = self._first_paragraph(soup)
-                image = self._extract_image(soup)
-                published = self._parse_published(soup)
+                summary = self._first_paragraph(root, meta)
+                image = self._extract_image(root, meta)
+                published = self._parse_published(root, meta)
 
                 # Full content only for special titles
                 content_html = None
                 content_text = None
                 if self._is_special_title(title):
-                    content_html = self._extract_full_html(soup)
-                    if content_html:
-                        content_text = _clean_html_text(content_html)
+                    # serialize and textify the same node; no re-parse of the HTML
+                    body = self._extract_body(root)
+                    if body is not None:
+                        content_html = lxml.html.tostring(body, encoding="unicode", with_tail=False)
+                        content_text = _text_of(body)
                         # (Optional) Upgrade summary when it's too short/empty
                         if content_text and (not summary or len(summary) < 60):
-                            summary = " ".join(content_text.split()[:60])
-
-                yield {
-                    "guid": link,
-                    "link": link,
-                    "title": title,
-                    "summary": summary,
-                    "published": published,   # aware UTC datetime
-                    "image": image,
+                            # _text_of already collapsed whitespace; split only the first 60 words
+                            summary = " ".join(content_text.split(" ", 60)[:60])
+
+                yield NewsEntry(
+                    guid=link,
+                    link=link,
+                    title=title,
+                    summary=summary,
+                    published=published,   # aware UTC datetime
+                    image=image,
                     # present only on special titles
-                    "content_html": content_html,
-                    "content_text": content_text,
-                }
+                    content_html=content_html,
+                    content_text=content_text,
+                )
 
             except Exception as e:
                 print(f"[TNCK] skip {link}: {e}")
+                failed = True
                 continue
+        if failed:
+            # keep the listing's new validators out of feed_meta, or a 304 next crawl
+            # would never give the skipped articles another try
+            FEED_META.pop(url, None)
 class VnEconomyHTMLParser(BaseParser):
     """
     Crawl listing pages on vneconomy.vn (e.g. /chung-khoan.htm), then open each
     article page and extract title/summary/image/published (UTC).
     """
+    __slots__ = ()
 
-    # Accept normal and www. subdomain; accept any .htm article (exclude obvious hubs)
+    # Accept normal and www. subdomain; accept any .htm article (exclude obvious hubs).
+    # Applied with fullmatch to the normalized href, so no ^/$ anchors.
     ARTICLE_RE = re.compile(
-        r"^https?://(?:www\.)?vneconomy\.vn/(?!chu-de/|tag/|video/|photo/)[^?#]+\.htm$",
+        r"https?://(?:www\.)?vneconomy\.vn/(?!chu-de/|tag/|video/|photo/)[^?#]+\.htm",
         re.IGNORECASE,
     )
-
-    def _fetch(self, url: str, timeout: int = 15) -> str:
+    ARTICLE_SUFFIX = ".htm"  # cheap prefilter before ARTICLE_RE
+
+    # --- Selectors / patterns compiled once (order = priority) ---
+    HEADER_NAV = _css(".layout-header-menu-main")
+    # 🔒 Only crawl featured cards; the classes sometimes appear alone, so include fallbacks.
+    # A selector group matches each card once, in document order.
+    CARD_SELECTOR = _css(", ".join([
+        ".featured-row_item.featured-column_item",
+        ".featured-column_item",
+        ".featured-row_item",
+    ]))
+    # first <p> of each article body container; one XPath call per container
+    FIRST_PARAGRAPH = tuple(_first_p_in(sel) for sel in (
+        "article", "div.article__content", "div.detail-content",
+        "div.content-detail", "div.detail__content", "div#contentdetail",
+    ))
+    IMAGE_SRC = _first_attr("article img, div.detail-content img, div.detail__content img", "src")
+    VISIBLE_DATE_RE = re.compile(r"\b\d{1,2}/\d{1,2}/\d{4}\b")
+
+    # Per-site article pool shared across listing pages; see TinNhanhChungKhoanHTMLParser
+    ARTICLE_WORKERS = 16
+    ARTICLE_POOL = ThreadPoolExecutor(max_workers=ARTICLE_WORKERS, thread_name_prefix="vneco-article")
+
+    def _fetch(self, url: str, timeout: int = 15, conditional: bool = False) -> Optional[Tuple[bytes, Optional[str]]]:
         headers = {
             "User-Agent": "Mozilla/5.0 (compatible; vneco-crawler/1.0)",
             "Accept-Language": "vi,en;q=0.8",
         }
-        r = requests.get(url, headers=headers, timeout=timeout)
-        r.raise_for_status()
-        return r.text
+        return _fetch_page(url, headers, timeout, conditional)
 
     def _normalize_href(self, href: str) -> str:
         # strip query/hash + any whitespace/zero-width
-        href = href.split("?", 1)[0].split("#", 1)[0]
+        href = href.partition("?")[0].partition("#")[0]
         return "".join(href.split())
 
-    def _resolve_article_urls(self, list_html: str, base_url: str) -> List[str]:
-        soup = BeautifulSoup(list_html, "lxml")
-        links: set[str] = set()
+    def _resolve_article_urls(self, root: etree._Element, base_url: str) -> List[str]:
+        """Article URLs in card (document) order, first occurrence kept, so `limit` takes the newest."""
+        links: Dict[str, None] = {}  # insertion-ordered set
 
         # Exclude anything inside the top nav
-        header_nav = soup.select_one(".layout-header-menu-main")
-
-        # 🔒 Only crawl featured cards
-        # If the page sometimes uses just one of these classes, include fallbacks:
-        card_selectors = [
-            ".featured-row_item.featured-column_item",
-            ".featured-column_item",
-            ".featured-row_item",
-        ]
-
-        cards = []
-        for sel in card_selectors:
-            cards.extend(soup.select(sel))
-
-        # De-dup card nodes while preserving order
-        seen_ids = set()
-        uniq_cards = []
-        for c in cards:
-            if id(c) in seen_ids: continue
-            uniq_cards.append(c); seen_ids.add(id(c))
-
-        # Known unwanted menu labels
-        skip_titles = {
-            "Thị trường - VnEconomy",
-            "Multimedia - VnEconomy",
-        }
+        header_nav = _select_one(root, self.HEADER_NAV)
+        origin = _origin(base_url)
+
+        uniq_cards = self.CARD_SELECTOR(root)
+        # raw href -> normalized article URL, or None when it isn't one; cards repeat links
+        resolved: Dict[str, Optional[str]] = {}
 
         for card in uniq_cards:
             # Prefer the first anchor in each card as the main article link
-            a = card.find("a", href=True)
+            a = XP_FIRST_HREF_A(card)
             if not a:
                 continue
+            a = a[0]
+
+            # Keep only real article pages; the URL test is cheapest, so it runs first
+            # (suffix check skips the regex for most hubs)
+            href = a.get("href")
+            if href in resolved:
+                norm = resolved[href]
+            else:
+                norm = self._normalize_href(_abs_url(href, base_url, origin))
+                if not (norm[-5:].lower().endswith(self.ARTICLE_SUFFIX) and self.ARTICLE_RE.fullmatch(norm)):
+                    norm = None
+                resolved[href] = norm
+            if norm is None or norm in links:
+                continue
 
             # Skip if the anchor is in the header menu area
-            if header_nav and a.find_parent(class_="layout-header-menu-main"):
+            if header_nav is not None and any(
+                "layout-header-menu-main" in (p.get("class") or "").split() for p in a.iterancestors()
+            ):
                 continue
 
-            # Skip by text guard (backup)
-            t = (a.get_text(" ", strip=True) or "")
-            if t in skip_titles or t.endswith(" - VnEconomy"):
+            # Skip by text guard (backup): menu labels like "Thị trường - VnEconomy"
+            if _text_of(a).endswith(" - VnEconomy"):
                 continue
 
-            href = urljoin(base_url, a["href"])
-            norm = self._normalize_href(href)
-
-            # Keep only real article pages
-            if self.ARTICLE_RE.search(norm):
-                links.add(norm)
+            links[norm] = None
 
-        return sorted(links)
+        return list(links)
 
-    def _first_paragraph(self, soup: BeautifulSoup) -> str:
+    def _first_paragraph(self, root: etree._Element, meta: Dict[str, str]) -> str:
         # Try common article content containers
-        body_selectors = [
-            "article", "div.article__content", "div.detail-content",
-            "div.content-detail", "div.detail__content", "div#contentdetail"
-        ]
-        for sel in body_selectors:
-            node = soup.select_one(sel)
-            if not node:
-                continue
-            p = node.find("p")
+        for xp in self.FIRST_PARAGRAPH:
+            p = xp(root)
             if p:
-                return _clean_html_text(str(p))
+                return _text_of(p[0])
         # Fallback to meta description
-        md = soup.find("meta", attrs={"name": "description"})
-        return (md.get("content", "").strip() if md else "") or ""
-
-    def _parse_published(self, soup: BeautifulSoup) -> datetime:
-        SHIFT = timedelta(hours=7)
+        return meta.get("description", "")
 
-        def minus7_utc(dt: datetime) -> datetime:
-            # ensure aware → UTC, then subtract 7h
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)  # treat naive as UTC before shifting
+    @staticmethod
+    def _minus7_utc(dt: datetime) -> datetime:
+        # ensure aware → UTC, then subtract 7h
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)  # treat naive as UTC before shifting
+        elif dt.tzinfo is not timezone.utc:
             dt = dt.astimezone(timezone.utc)
-            return dt - SHIFT  # final is still tz-aware (UTC)
+        return dt - VN_OFFSET  # final is still tz-aware (UTC)
+
+    def _parse_published(self, root: etree._Element, meta: Dict[str, str]) -> datetime:
 
         # Prefer meta timestamps
-        for prop in ("article:published_time", "og:updated_time", "pubdate"):
-            m = soup.find("meta", attrs={"property": prop}) or soup.find("meta", attrs={"name": prop})
-            if m and m.get("content"):
+        for prop in META_DATE_PROPS:
+            content = meta.get(prop)
+            if content:
                 try:
-                    dt = dtparse.parse(m["content"])
-                    return minus7_utc(dt)
+                    dt = _dtparse(content)
+                    return self._minus7_utc(dt)
                 except Exception:
                     pass
 
         # <time datetime="...">
-        t = soup.find("time", attrs={"datetime": True})
-        if t and t.get("datetime"):
+        t = XP_TIME_DATETIME(root)
+        if t:
             try:
-                dt = dtparse.parse(t["datetime"])
-                return minus7_utc(dt)
+                dt = _dtparse(t)
+                return self._minus7_utc(dt)
             except Exception:
                 pass
 
         # Fallback visible time like 30/07/2025 15:46
-        tnode = soup.find(["time", "span", "div"], string=re.compile(r"\b\d{1,2}/\d{1,2}/\d{4}\b"))
-        if tnode:
+        for tnode in root.iter("time", "span", "div"):
+            if len(tnode) or not tnode.text or not self.VISIBLE_DATE_RE.search(tnode.text):
+                continue
             try:
-                dt = dtparse.parse(tnode.get_text(" ", strip=True), dayfirst=True)
-                return minus7_utc(dt)
+                dt = _dtparse(tnode.text.strip(), dayfirst=True)
+                return self._minus7_utc(dt)
             except Exception:
                 pass
+            break
 
         return datetime.now(timezone.utc)
 
-    def _extract_image(self, soup: BeautifulSoup) -> Optional[str]:
-        og = soup.find("meta", attrs={"property": "og:image"})
-        if og and og.get("content"):
-            return og["content"].strip()
-        img = soup.select_one("article img, div.detail-content img, div.detail__content img")
-        return (img.get("src").strip() if img and img.get("src") else None)
+    def _extract_image(self, root: etree._Element, meta: Dict[str, str]) -> Optional[str]:
+        og = meta.get("og:image")
+        if og:
+            return og
+        return self.IMAGE_SRC(root).strip() or None
 
-    def parse(self, url: str, ctx: FeedContext) -> Iterable[Dict[str, Any]]:
+    def parse(self, url: str, ctx: FeedContext, limit: Optional[int] = None) -> Iterable[NewsEntry]:
         try:
-            listing_html = self._fetch(url)
+            fetched = self._fetch(url, conditional=True)
+            if fetched is None:  # 304: listing unchanged since the last crawl
+                return []
+            listing = _parse_html_bytes(*fetched)
         except Exception as e:
             print(f"[VNECO] list fetch failed: {url} -> {e}")
+            FEED_META.pop(url, None)  # validators may be stored already; a 304 would skip the retry
             return []
 
-        article_urls = self._resolve_article_urls(listing_html, url)
+        article_urls = self._resolve_article_urls(listing, url)[:limit]
+        del listing  # the listing tree is not needed while articles are fetched
 
-        for link in article_urls:
+        # Fetch articles concurrently; parse each page here as it arrives
+        failed = False
+        pool = self.ARTICLE_POOL  # shared, so no `with`: shutting it down would end other listings' fetches
+        futures = {pool.submit(self._fetch, link): link for link in article_urls}
+        for future in as_completed(futures):
+            link = futures[future]
             try:
-                html = self._fetch(link)
-                soup = BeautifulSoup(html, "lxml")
+                root = _parse_html_bytes(*future.result())
 
+                meta = _meta_map(root)  # every <meta> lookup below is a dict hit
+                h1 = XP_FIRST_H1(root)
                 title = (
-                    (soup.find("meta", attrs={"property": "og:title"}) or {}).get("content")
-                    or (soup.find("h1") or {}).get_text(strip=True)
+                    meta.get("og:title")
+                    or (_text_of(h1[0]) if h1 else "")
                     or ""
                 ).strip()
 
-                summary = self._first_paragraph(soup)
-                image = self._extract_image(soup)
-                published = self._parse_published(soup)
-
-                yield {
-                    "guid": link,
-                    "link": link,
-                    "title": title,
-                    "summary": summary,
-                    "published": published,  # aware datetime (UTC)
-                    "image": image,
-                }
+                summary = self._first_paragraph(root, meta)
+                image = self._extract_image(root, meta)
+                published = self._parse_published(root, meta)
+
+                yield NewsEntry(
+                    guid=link,
+                    link=link,
+                    title=title,
+                    summary=summary,
+                    published=published,  # aware datetime (UTC)
+                    image=image,
+                )
             except Exception as e:
                 print(f"[VNECO] skip {link}: {e}")
+                failed = True
                 continue
+        if failed:
+            # keep the listing's new validators out of feed_meta, or a 304 next crawl
+            # would never give the skipped articles another try
+            FEED_META.pop(url, None)
 
 # ---------- registry & accessor ----------
 
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
-import os, json, glob, datetime
+import os, json, datetime
+from functools import lru_cache
 
+try:
+    import orjson  # fast JSON encode/decode
+except ImportError:
+    orjson = None
 
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str):
-    """Extract dates from filenames like MM-dd-YYYY.json"""
+    """Extract dates from filenames like MM-dd-YYYY.json (memoized; app.py and build_index
+    both walk the same names in one run). Raises ValueError for anything else."""
     m, d, y = map(int, date_str.split("-"))
     return datetime.date(y, m, d)
 
@@ -17,29 +25,37 @@ def build_index(base: str = "docs/news") -> int:
     BASE = base
     os.makedirs(BASE, exist_ok=True)
 
-    files = [
-        f for f in glob.glob(os.path.join(BASE, "*.json"))
-        if os.path.basename(f) not in ("index.json")
-    ]
-
-    dates: list[str] = []
-    for f in files:
-        name = os.path.splitext(os.path.basename(f))[0]
-        try:
-            parse_date(name)  # validate
-            dates.append(name)
-        except Exception:
-            pass
-
-    dates = sorted(set(dates), key=parse_date, reverse=True)
+    # Only filenames matter: one scandir pass, each name parsed once, no file is opened
+    dated: list[tuple] = []
+    digested: list[tuple] = []
+    with os.scandir(BASE) as it:
+        for entry in it:
+            stem, ext = os.path.splitext(entry.name)
+            if ext != ".json":
+                continue
+            bucket = dated
+            if stem.startswith("digest-"):
+                stem, bucket = stem[len("digest-"):], digested
+            try:
+                bucket.append((parse_date(stem), stem))  # validate; skips index.json, digest.json
+            except Exception:
+                pass
 
-    # Collect digests
-    digest_files = glob.glob(os.path.join(BASE, "digest-*.json"))
-    digests = sorted(set(os.path.basename(f).replace("digest-", "").replace(".json", "") for f in digest_files), key=parse_date, reverse=True)
+    # names in one directory are unique, so no dedup pass; the date in the tuple is the key
+    dated.sort(reverse=True)
+    digested.sort(reverse=True)
+    dates = [name for _, name in dated]
+    digests = [name for _, name in digested]
 
     # Write index.json
-    with open(os.path.join(BASE, "index.json"), "w", encoding="utf-8") as out:
-        json.dump({"dates": dates, "digests": digests}, out, ensure_ascii=False, separators=(",", ":"))
+    payload = {"dates": dates, "digests": digests}
+    path = os.path.join(BASE, "index.json")
+    with open(path + ".tmp", "wb") as out:
+        if orjson:
+            out.write(orjson.dumps(payload))  # same compact UTF-8 as the json call below
+        else:
+            out.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    os.replace(path + ".tmp", path)  # the site never fetches a half-written index
 
     print(f"Index built with {len(dates)} date(s) and {len(digests)} digest(s).")
     return len(dates)
@@ -1,16 +1,87 @@
 #!/usr/bin/env python3
-import os, json, glob, re, yaml
+import os, json, glob, re, yaml, hashlib, unicodedata
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from openai import OpenAI
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics.pairwise import linear_kernel
+from scipy.sparse import triu
+from scipy.sparse.csgraph import connected_components
+
+try:
+    from scripts.day_files import write_day
+    from scripts.openrouter import THINK_RE, get_client, parse_json_reply
+except ImportError:  # run as `python scripts/cluster_news.py`
+    from day_files import write_day
+    from openrouter import THINK_RE, get_client, parse_json_reply
 
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
     from backports.zoneinfo import ZoneInfo
 
+try:
+    import orjson  # fast JSON encode/decode
+except ImportError:
+    orjson = None
+
 TIMEZONE = ZoneInfo("Asia/Ho_Chi_Minh")
+TOKEN_RE = re.compile(r"\w+")  # str patterns are Unicode-aware: keeps ư, ơ, đ, ấ... in-word
+# Function words shared by unrelated headlines; their n-grams only add noise to the match
+VI_STOP = frozenset("""
+và của là có các những một cho với trong được đã sẽ đang này khi để từ về theo tại do
+bị thì mà như ra vào lên sau trước nhiều hơn không cũng còn rằng nào gì ở
+""".split())
+
+def preprocess_title(title):
+    """Lowercased NFC title without Vietnamese stopwords. NFC first: some feeds send
+    decomposed diacritics, which would neither match composed n-grams nor stay in \\w."""
+    tokens = TOKEN_RE.findall(unicodedata.normalize("NFC", title).lower())
+    return " ".join(t for t in tokens if t not in VI_STOP)
+
+# Stateless title vectorizer: no vocabulary pass, and character n-grams within word
+# boundaries still match titles that differ in a diacritic or a word form
+VECTORIZER = HashingVectorizer(
+    n_features=2**18, analyzer="char_wb", ngram_range=(3, 5),
+    preprocessor=preprocess_title,
+    alternate_sign=False, norm="l2",
+    binary=True,  # a repeated n-gram in a short headline counts once (cf. sublinear_tf)
+    dtype=np.float32,  # plenty for a >threshold test; halves the similarity product's traffic
+)
+AI_WORKERS = 8  # concurrent OpenRouter requests; calls are network-bound
+AI_BATCH_SIZE = 6  # clusters per request; override with ai.cluster_batch_size
+# Completion-token cap of one batched request (ai.max_tokens_batch); keep it under the
+# model's output limit, or the batch call fails and every cluster falls back to its own call
+AI_MAX_TOKENS_BATCH = 8000
+AI_CACHE_PATH = ".cache/ai_summaries.json"  # cluster key -> summary, reused across runs
+AI_CACHE = {}  # read-only copy inside each worker process; see init_worker
+
+def cluster_key(master_title, cluster_items):
+    """Content address of a cluster: its master title plus its member item_ids."""
+    ids = sorted(it["item_id"] for it in cluster_items)
+    raw = json.dumps([master_title, ids], ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def load_ai_cache(path=AI_CACHE_PATH):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        data = {}
+    return data if isinstance(data, dict) else {}
+
+def save_ai_cache(cache, path=AI_CACHE_PATH):
+    """Write via a temp file + rename so an interrupted run can't leave a torn cache."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def init_worker(cache):
+    AI_CACHE.update(cache)
 
 def get_ai_summary(master_title, cluster_items, client, ai_cfg):
     """Generate a synthesized summary for a cluster of news using LLM."""
@@ -41,7 +112,9 @@ Yêu cầu:
         response = client.chat.completions.create(
             model=ai_model,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            temperature=ai_cfg.get("temperature", 0.3),
+            top_p=ai_cfg.get("top_p", 0.9),
         )
         
         if not response or not hasattr(response, 'choices') or not response.choices:
@@ -52,91 +125,237 @@ Yêu cầu:
             return None
             
         # Strip reasoning block if present (for R1 models)
-        clean_content = re.sub(r'<think>.*?</think>', '', raw_content, flags=re.DOTALL).strip()
+        clean_content = THINK_RE.sub('', raw_content).strip()
         return clean_content
     except Exception as e:
         print(f"  AI Summary Error: {e}")
         return None
 
-def cluster_news(news_dir="docs/news", threshold=0.75):
+def get_ai_summaries(batch, client, ai_cfg):
+    """Synthesize summaries for several clusters in one LLM request.
+
+    batch: list of (master_title, cluster_items). Returns {index in batch: summary};
+    clusters the model skipped (or a failed call) are simply absent.
+    """
+    if not client: return {}
+
+    groups = []
+    for i, (master_title, cluster_items) in enumerate(batch):
+        context = "---".join(f"Title: {it['title']}\nSummary: {it['summary']}" for it in cluster_items)
+        groups.append(f"### Nhóm {i}\nTiêu đề chính: {master_title}\n\nDữ liệu từ các nguồn:\n{context}")
+
+    groups_text = "\n\n".join(groups)
+    prompt = f"""Bạn là một chuyên gia tin tức. Với MỖI nhóm tin tức cùng chủ đề dưới đây, hãy viết một bản tóm tắt tổng hợp (synthesized summary) duy nhất.
+
+{groups_text}
+
+Yêu cầu cho mỗi bản tóm tắt:
+1. Viết bằng tiếng Việt, súc tích (khoảng 3-4 câu).
+2. Tập trung vào sự kiện chính và các con số/chi tiết quan trọng nhất từ tất cả nguồn.
+3. Không lặp lại tên báo trong nội dung tóm tắt.
+4. Văn phong báo chí hiện đại.
+
+Trả về DUY NHẤT JSON dạng {{"summaries": [{{"id": <số nhóm>, "summary": "..."}}]}}
+"""
+
+    ai_model = ai_cfg.get("model", "deepseek/deepseek-r1-0528")
+    # summarize_pending sizes batches so this stays within ai.max_tokens_batch
+    max_tokens = ai_cfg.get("max_tokens_cluster", 2000) * len(batch)
+
+    try:
+        response = client.chat.completions.create(
+            model=ai_model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=ai_cfg.get("temperature", 0.3),
+            top_p=ai_cfg.get("top_p", 0.9),
+            response_format={"type": "json_object"},
+        )
+
+        if not response or not hasattr(response, 'choices') or not response.choices:
+            return {}
+
+        raw_content = response.choices[0].message.content
+        if not raw_content:
+            return {}
+
+        result = parse_json_reply(raw_content)
+
+        summaries = {}
+        for entry in result.get("summaries", []):
+            try:
+                idx = int(entry.get("id"))
+            except (TypeError, ValueError):
+                continue
+            summary = (entry.get("summary") or "").strip()
+            if 0 <= idx < len(batch) and summary:
+                summaries[idx] = summary
+        return summaries
+    except Exception as e:
+        print(f"  AI Batch Summary Error: {e}")
+        return {}
+
+def summarize_batch(batch, client, ai_cfg):
+    """One request for the whole batch; clusters it missed fall back to a single-cluster call."""
+    summaries = get_ai_summaries(batch, client, ai_cfg) if len(batch) > 1 else {}
+    return [
+        summaries[i] if i in summaries else get_ai_summary(master_title, cluster_items, client, ai_cfg)
+        for i, (master_title, cluster_items) in enumerate(batch)
+    ]
+
+def process_file(fpath, threshold, summarize, keep=False):
+    """
+    Cluster one day file; runs in a worker process and makes no AI calls. Clusters still
+    needing a summary (when `summarize`) are handed back instead: returns (items, pending)
+    with pending = [(position of the master in items, cluster_key, cluster items)]. With
+    nothing pending the file is written here and items is returned only when `keep`;
+    otherwise the caller fills in the summaries and writes the file.
+    """
+    with open(fpath, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw.decode("utf-8"))
+    
+    items = list(data.values())
+    pending = []  # (master, cluster items, key) awaiting an AI summary
+    if not items: return (items if keep else None), pending
+    
+    # Prepare titles for vectorizing
+    titles = [it.get("title", "") for it in items]
+    if len(titles) < 2: 
+        # Still save but identify as single source
+        for it in items: it["cluster_count"] = 1
+    else:
+        title_matrix = VECTORIZER.transform(titles)
+        # Rows are L2-normalized, so the plain dot product (linear_kernel) is already
+        # cosine similarity; keep it sparse, keep only the strict upper triangle (no
+        # self-loops, each pair once) and the edges above threshold, then clusters are
+        # the connected components of that undirected graph
+        sim = triu(linear_kernel(title_matrix, dense_output=False), k=1, format="csr")
+        sim.data[sim.data <= threshold] = 0
+        sim.eliminate_zeros()
+        if not sim.nnz:
+            # no edges left: every item is its own cluster
+            clusters = [[idx] for idx in range(len(titles))]
+        else:
+            _, labels = connected_components(sim, directed=False)
+
+            # Group by component with NumPy (stable sort keeps members in item order),
+            # then order clusters by their first item so the earliest item stays master
+            order = np.argsort(labels, kind="stable")
+            groups = np.split(order, np.flatnonzero(np.diff(labels[order])) + 1)
+            groups.sort(key=lambda g: g[0])
+            clusters = [g.tolist() for g in groups]
+            
+        final_items = {}
+        for c in clusters:
+            master_idx = c[0]
+            master = items[master_idx]
+            
+            sources = []
+            cluster_items_data = [] # To send to LLM
+            for idx in c:
+                it = items[idx]
+                sources.append({"name": it["source"], "link": it["link"]})
+                cluster_items_data.append(it)
+            
+            master["sources"] = sources
+            master["cluster_count"] = len(sources)
+            
+            # If hot story (multiple sources), queue it for an AI summary
+            if len(sources) > 1 and summarize:
+                if master.get("ai_summary"):
+                    print(f"  Skipping cluster (already summarized): {master['title'][:50]}...")
+                else:
+                    key = cluster_key(master["title"], cluster_items_data)
+                    if key in AI_CACHE:
+                        # same title + same members as a cluster summarized on an earlier run
+                        master["ai_summary"] = AI_CACHE[key]
+                    else:
+                        print(f"  Synthesizing cluster: {master['title'][:50]}... ({len(sources)} sources)")
+                        pending.append((master, cluster_items_data, key))
+            
+            final_items[master["item_id"]] = master
+
+        items = list(final_items.values())
+        
+    # Sort and Save back
+    items.sort(key=lambda x: x.get("published", ""), reverse=True)
+    if pending:
+        # dicts don't survive the trip to the parent by identity; hand back positions
+        pos = {it["item_id"]: i for i, it in enumerate(items)}
+        return items, [(pos[m["item_id"]], key, c) for m, c, key in pending]
+    write_day(fpath, items)
+    return (items if keep else None), pending
+
+def summarize_pending(pending, client, ai_cfg, cache):
+    """
+    Fill in the summaries the workers queued, as [(master, cluster_key, cluster items)].
+    One AI_WORKERS pool for the whole run keeps OpenRouter concurrency at AI_WORKERS
+    however many processes did the clustering; several clusters go in each request.
+    """
+    # no more clusters per request than their token budgets fit under the batch cap
+    per_cluster = max(1, int(ai_cfg.get("max_tokens_cluster", 2000)))
+    fits = int(ai_cfg.get("max_tokens_batch", AI_MAX_TOKENS_BATCH)) // per_cluster
+    batch_size = max(1, min(int(ai_cfg.get("cluster_batch_size", AI_BATCH_SIZE)), fits))
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    with ThreadPoolExecutor(max_workers=AI_WORKERS) as pool:
+        results = pool.map(
+            lambda b: summarize_batch([(m["title"], c) for m, _, c in b], client, ai_cfg), batches
+        )
+        for b, summaries in zip(batches, results):
+            for (master, key, _), summary in zip(b, summaries):
+                master["ai_summary"] = summary
+                if summary:
+                    cache[key] = summary
+
+def cluster_news(news_dir="docs/news", threshold=0.75, keep_dates=()):
+    """
+    Cluster every day file in `news_dir`. Returns {date: clustered items} for the
+    dates in `keep_dates` (e.g. the digest's days), so they can be used in-process.
+    """
     files = glob.glob(os.path.join(news_dir, "*.json"))
     files = [f for f in files if "index.json" not in f and "digest" not in f]
+    stems = [os.path.splitext(os.path.basename(f))[0] for f in files]
+    keeps = [stem in keep_dates for stem in stems]
     
     # Load AI config
     with open("config.yaml", "r", encoding="utf-8") as f:
         config = yaml.safe_load(f) or {}
     ai_cfg = config.get("ai", {})
 
-    # Initialize OpenAI client for OpenRouter
-    api_key = os.environ.get("OPENROUTER_API_KEY")
-    client = None
-    if api_key:
-        client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=api_key)
-    else:
+    client = get_client()
+    if not client:
         print("Warning: OPENROUTER_API_KEY not found. Skipping AI cluster summarization.")
 
-    for fpath in files:
-        with open(fpath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        items = list(data.values())
-        if not items: continue
-        
-        # Prepare titles for TF-IDF
-        titles = [it.get("title", "") for it in items]
-        if len(titles) < 2: 
-            # Still save but identify as single source
-            for it in items: it["cluster_count"] = 1
-        else:
-            vectorizer = TfidfVectorizer(stop_words=None)
-            tfidf_matrix = vectorizer.fit_transform(titles)
-            sim_matrix = cosine_similarity(tfidf_matrix)
-            
-            assigned = [False] * len(items)
-            clusters = []
-            
-            for idx in range(len(items)):
-                if assigned[idx]: continue
-                current_cluster = [idx]
-                assigned[idx] = True
-                for other_idx in range(idx + 1, len(items)):
-                    if not assigned[other_idx] and sim_matrix[idx][other_idx] > threshold:
-                        current_cluster.append(other_idx)
-                        assigned[other_idx] = True
-                clusters.append(current_cluster)
-                
-            final_items = {}
-            for c in clusters:
-                master_idx = c[0]
-                master = items[master_idx]
-                
-                sources = []
-                cluster_items_data = [] # To send to LLM
-                for idx in c:
-                    it = items[idx]
-                    sources.append({"name": it["source"], "link": it["link"]})
-                    cluster_items_data.append(it)
-                
-                master["sources"] = sources
-                master["cluster_count"] = len(sources)
-                
-                # If hot story (multiple sources), call AI
-                if len(sources) > 1 and client:
-                    if master.get("ai_summary"):
-                        print(f"  Skipping cluster (already summarized): {master['title'][:50]}...")
-                    else:
-                        print(f"  Synthesizing cluster: {master['title'][:50]}... ({len(sources)} sources)")
-                        master["ai_summary"] = get_ai_summary(master["title"], cluster_items_data, client, ai_cfg)
-                
-                final_items[master["item_id"]] = master
-            items = list(final_items.values())
-            
-        # Sort and Save back
-        items.sort(key=lambda x: x.get("published", ""), reverse=True)
-        with open(fpath, "w", encoding="utf-8") as f:
-            json.dump({it["item_id"]: it for it in items}, f, ensure_ascii=False, separators=(",", ":"))
+    # Clustering is CPU-bound and days are independent, so it fans out over processes;
+    # workers get a snapshot of the summary cache and hand back the clusters it missed
+    cache = load_ai_cache()
+    kept = {}
+    unwritten = []  # (path, items) of days waiting on AI summaries
+    pending = []
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=init_worker, initargs=(cache,)) as pool:
+        results = pool.map(process_file, files, repeat(threshold), repeat(client is not None), keeps)
+        for fpath, stem, keep, (items, day_pending) in zip(files, stems, keeps, results):
+            if day_pending:
+                unwritten.append((fpath, items))
+                pending.extend((items[i], key, c) for i, key, c in day_pending)
+            if keep:
+                kept[stem] = items
+
+    # AI calls are network-bound: one pool here, not one per worker process
+    if pending:
+        summarize_pending(pending, client, ai_cfg, cache)
+    for fpath, items in unwritten:
+        write_day(fpath, items)
+    save_ai_cache(cache)
             
     print(f"Clustered {len(files)} files.")
+    return kept
 
 if __name__ == "__main__":
-    cluster_news()
+    # Cluster, then build the digest from the clustered days still in memory
+    try:
+        from scripts.daily_digest import digest_dates, generate_digest
+    except ImportError:  # run as `python scripts/cluster_news.py`
+        from daily_digest import digest_dates, generate_digest
+    generate_digest(data=cluster_news(keep_dates=digest_dates()))
@@ -1,10 +1,14 @@
 import datetime
+import heapq
 import os
 import json
-import re
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 
-from openai import OpenAI
+try:
+    from scripts.openrouter import get_client, parse_json_reply
+except ImportError:  # run as `python scripts/daily_digest.py`
+    from openrouter import get_client, parse_json_reply
 
 try:
     from zoneinfo import ZoneInfo
@@ -12,51 +16,68 @@ except ImportError:
     from backports.zoneinfo import ZoneInfo
 
 TIMEZONE = ZoneInfo("Asia/Ho_Chi_Minh")
+DIGEST_WORKERS = 4  # concurrent digest requests when backfilling; calls are network-bound
+
+def digest_dates(now=None):
+    """Today's and yesterday's file dates (MM-dd-YYYY) in Vietnam Time."""
+    now = now or datetime.datetime.now(TIMEZONE)
+    return [now.strftime("%m-%d-%Y"), (now - datetime.timedelta(days=1)).strftime("%m-%d-%Y")]
 
-def generate_digest(news_dir="docs/news"):
-    # Get today's and yesterday's files in Vietnam Time
+def atomic_write(path, data_bytes):
+    """Write via a temp file + rename so readers never see a half-written digest."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data_bytes)
+    os.replace(tmp, path)
+
+def generate_digest(news_dir="docs/news", data=None, date=None, client=None):
+    """
+    Build the daily digest. `data` maps date -> items already in memory (as returned by
+    cluster_news); dates missing from it are read from `news_dir`. `date` (MM-dd-YYYY)
+    builds the digest of a past day instead of today; digest.json only follows today.
+    """
     now = datetime.datetime.now(TIMEZONE)
-    today = now.strftime("%m-%d-%Y")
-    yesterday = (now - datetime.timedelta(days=1)).strftime("%m-%d-%Y")
-    
-    selected_files = []
+    day = now
+    if date:
+        day = datetime.datetime.strptime(date, "%m-%d-%Y").replace(tzinfo=TIMEZONE)
+    today, yesterday = digest_dates(day)
+    data = data or {}
+
+    day_items = []
     for d in [today, yesterday]:
+        if d in data:
+            day_items.append(data[d])
+            continue
         p = os.path.join(news_dir, f"{d}.json")
-        if os.path.exists(p): selected_files.append(p)
+        if os.path.exists(p):
+            with open(p, "r", encoding="utf-8") as f:
+                day_items.append(list(json.load(f).values()))
         
-    if not selected_files: return
+    if not day_items: return
     
     # Collect top items
     all_headlines = []
-    for fpath in selected_files:
-        with open(fpath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            items = list(data.values())
-            items.sort(key=lambda x: x.get("cluster_count", 0), reverse=True)
-            for it in items[:15]:
-                all_headlines.append({
-                    "title": it['title'],
-                    "source": it['source'],
-                    "link": it['link']
-                })
+    for items in day_items:
+        # equivalent to sorted(..., reverse=True)[:15], ties included, without sorting it all
+        for it in heapq.nlargest(15, items, key=lambda x: x.get("cluster_count", 0)):
+            all_headlines.append({
+                "title": it['title'],
+                "source": it['source'],
+                "link": it['link']
+            })
                 
     if not all_headlines: return
     
     # Format headlines text with links for prompt
     headlines_text = "\n".join([f"- {h['title']} (Nguồn: {h['source']}, Link: {h['link']})" for h in all_headlines])
 
-    api_key = os.environ.get("OPENROUTER_API_KEY")
-    if not api_key:
+    client = client or get_client()
+    if not client:
         print("No OPENROUTER_API_KEY found. Skipping digest.")
         return
-        
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
     
     # Vietnamese display date for prompt
-    display_date = now.strftime("%d/%m/%Y")
+    display_date = day.strftime("%d/%m/%Y")
 
     prompt = f"""Bạn là một biên tập viên tin tức AI chuyên nghiệp. Hôm nay là ngày {display_date}. 
 Hãy phân tích các tin tức sau và tạo một bản tin "Catch up" (Tổng hợp các điểm tin quan trọng) dưới định dạng JSON.
@@ -101,7 +122,10 @@ Trả về JSON schema:
         response = client.chat.completions.create(
             model=ai_model, 
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            temperature=ai_cfg.get("temperature", 0.3),
+            top_p=ai_cfg.get("top_p", 0.9),
+            response_format={"type": "json_object"},
         )
         
         if not response or not hasattr(response, 'choices') or not response.choices:
@@ -113,12 +137,7 @@ Trả về JSON schema:
             print("Error: No content returned from API.")
             return
 
-        # Strip reasoning block if present (for R1 models)
-        clean_content = re.sub(r'<think>.*?</think>', '', raw_content, flags=re.DOTALL).strip()
-        
-        # Clean potential markdown block
-        json_str = re.sub(r'```json\s*|\s*```', '', clean_content).strip()
-        result = json.loads(json_str)
+        result = parse_json_reply(raw_content)
         
         digest_data = {
             "date": today,
@@ -127,16 +146,37 @@ Trả về JSON schema:
             "updated": now.isoformat()
         }
         
-        with open(os.path.join(news_dir, f"digest-{today}.json"), "w", encoding="utf-8") as f:
-            json.dump(digest_data, f, ensure_ascii=False, separators=(",", ":"))
+        data_bytes = json.dumps(digest_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        atomic_write(os.path.join(news_dir, f"digest-{today}.json"), data_bytes)
         
+        if today != now.strftime("%m-%d-%Y"):
+            print(f"Structured daily digest generated: digest-{today}.json")
+            return
+
         # Also save as daily.json (or keep digest.json) for the "Latest" pointer
-        with open(os.path.join(news_dir, "digest.json"), "w", encoding="utf-8") as f:
-            json.dump(digest_data, f, ensure_ascii=False, separators=(",", ":"))
+        atomic_write(os.path.join(news_dir, "digest.json"), data_bytes)
             
         print(f"Structured daily digest generated: digest-{today}.json and digest.json")
     except Exception as e:
         print(f"Error generating digest: {e}")
 
+def backfill_digests(dates, news_dir="docs/news", workers=DIGEST_WORKERS):
+    """Build the digests of several past dates concurrently, sharing one client."""
+    client = get_client()
+    if not client:
+        print("No OPENROUTER_API_KEY found. Skipping digest.")
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda d: generate_digest(news_dir, date=d, client=client), dates))
+
 if __name__ == "__main__":
-    generate_digest()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate the daily digest.')
+    parser.add_argument('dates', nargs='*',
+                      help='Backfill digests for these dates (MM-dd-YYYY) instead of today')
+    args = parser.parse_args()
+    if args.dates:
+        backfill_digests(args.dates)
+    else:
+        generate_digest()
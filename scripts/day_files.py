@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Writing docs/news/<MM-dd-YYYY>.json day files; shared by app.py and cluster_news.py."""
+import os, json
+
+try:
+    import orjson  # fast JSON encode/decode
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON bytes; orjson when available, stdlib json otherwise."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_day(path, items) -> None:
+    """
+    Write `items` (already in display order) as {item_id: item}: the same bytes as dumping
+    the whole mapping, but streamed one item at a time so neither the dict nor the document
+    is built in memory. Goes to a temp file renamed over `path`, so readers and an
+    interrupted run never see half a day.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"{")
+        for n, item in enumerate(items):
+            if n:
+                f.write(b",")
+            f.write(dumps(item["item_id"]))
+            f.write(b":")
+            f.write(dumps(item))
+        f.write(b"}")
+    os.replace(tmp, path)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""OpenRouter client and reply parsing shared by cluster_news.py and daily_digest.py."""
+import os, json, re
+from functools import lru_cache
+import httpx
+from openai import OpenAI
+
+try:
+    import h2  # noqa: F401  -- enables httpx HTTP/2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+BASE_URL = "https://openrouter.ai/api/v1"
+POOL_SIZE = 8  # keep-alive connections per process; the callers run up to 8 request threads
+AI_TIMEOUT = 600.0  # seconds; openai's default, reasoning models can be slow to answer
+# Retries after the first attempt on 429/5xx/connection errors; openai's client backs off
+# exponentially with jitter and honours Retry-After, so no retry loop of our own
+AI_MAX_RETRIES = 3
+THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)  # R1-style reasoning block
+FENCE_RE = re.compile(r'```(?:json)?\s*|\s*```')  # markdown code fence around JSON
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    """OpenRouter client built once per process (clients must not cross a fork); None without OPENROUTER_API_KEY."""
+    api_key = os.environ.get("OPENROUTER_API_KEY")
+    if not api_key:
+        return None
+    # One pooled httpx client per process: request threads share keep-alive connections
+    # (multiplexed over one connection when HTTP/2 is available) instead of re-handshaking
+    http_client = httpx.Client(
+        http2=HTTP2,
+        limits=httpx.Limits(max_connections=POOL_SIZE * 2, max_keepalive_connections=POOL_SIZE),
+        timeout=httpx.Timeout(AI_TIMEOUT, connect=10.0),
+    )
+    return OpenAI(base_url=BASE_URL, api_key=api_key, http_client=http_client, max_retries=AI_MAX_RETRIES)
+
+
+def parse_json_reply(raw_content):
+    """JSON from a model reply. With response_format=json_object it usually parses as-is;
+    only when it doesn't, strip a reasoning block / markdown fence and try again."""
+    try:
+        return json.loads(raw_content)
+    except json.JSONDecodeError:
+        clean_content = THINK_RE.sub('', raw_content).strip()
+        return json.loads(FENCE_RE.sub('', clean_content).strip())
@@ -0,0 +1,52 @@
+import io
+import os
+import unittest
+
+from parsers import _read_feed_entries
+
+FEEDS = os.path.join(os.path.dirname(__file__), "feeds")
+
+
+class TrickleStream(io.BytesIO):
+    """Serves a few bytes per read so entities and CDATA markers straddle chunk boundaries."""
+
+    def read(self, size=-1):
+        return super().read(7)
+
+
+def read_entries(name, stream_cls=io.BytesIO):
+    with open(os.path.join(FEEDS, name), "rb") as f:
+        return list(_read_feed_entries(stream_cls(f.read())))
+
+
+class FeedReaderTest(unittest.TestCase):
+    def check_entities_feed(self, entries):
+        self.assertEqual(len(entries), 3)
+        first, second, third = entries
+        self.assertEqual(first["title"], "AT&T mua lại \xa0 công ty X")
+        self.assertEqual(first["link"], "https://example.com/a?id=1&ref=rss")
+        self.assertEqual(first["summary"], 'Giá "vàng" – tăng mạnh … đạt đỉnh')
+        # CDATA is left as written
+        self.assertEqual(second["title"], "Lợi nhuận Q&A &nbsp;giữ nguyên")
+        self.assertEqual(second["summary"], "<p>R&amp;D &ndash; <b>tăng</b></p>")
+        self.assertEqual(second["link"], "https://example.com/b?x=1&y=2")
+        # unknown names and unterminated references stay as text
+        self.assertEqual(third["title"], "Không rõ &foo; và &amp")
+
+    def test_html_entities_and_bare_ampersands(self):
+        self.check_entities_feed(read_entries("entities.xml"))
+
+    def test_chunk_boundaries(self):
+        self.check_entities_feed(read_entries("entities.xml", TrickleStream))
+
+    def test_rss1_rdf_items(self):
+        (entry,) = read_entries("rdf.xml")
+        self.assertEqual(entry["id"], "https://example.com/rdf-1")
+        self.assertEqual(entry["link"], "https://example.com/rdf-1")
+        self.assertEqual(entry["title"], "Chứng khoán – phiên sáng")
+        self.assertEqual(entry["summary"], "Tóm tắt")
+        self.assertEqual(entry["published"], "2025-01-06T08:00:00+07:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
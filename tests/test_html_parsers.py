@@ -0,0 +1,63 @@
+import unittest
+
+from parsers import FeedContext, TinNhanhChungKhoanHTMLParser, VnEconomyHTMLParser, _parse_html_bytes
+
+TNCK_LISTING = b'<div class="main-column"><a href="/su-kien-post1.html">x</a></div>'
+TNCK_ARTICLE = """<html><head><meta property="og:title" content="Sự kiện chứng khoán đáng chú ý ngày 6/1">
+</head><body><div class="article__body"><p>Nội dung</p></div>TAIL TEXT HERE</body></html>""".encode("utf-8")
+
+
+class StubTNCK(TinNhanhChungKhoanHTMLParser):
+    """Serves a fixed listing and article instead of fetching them."""
+    __slots__ = ()
+
+    def _fetch(self, url, timeout=15, conditional=False):
+        return (TNCK_LISTING if conditional else TNCK_ARTICLE), None
+
+
+class ArticleOrderTest(unittest.TestCase):
+    def test_tnck_links_keep_listing_order(self):
+        listing = _parse_html_bytes(b"""<div class="main-column">
+            <a href="/z-post3.html">z</a><a href="/a-post1.html">a</a>
+            <a href="/z-post3.html?utm=x">z again</a><a href="/m-post2.html">m</a></div>""")
+        urls = TinNhanhChungKhoanHTMLParser()._resolve_article_urls(
+            listing, "https://www.tinnhanhchungkhoan.vn/chung-khoan/")
+        self.assertEqual(urls, [
+            "https://www.tinnhanhchungkhoan.vn/z-post3.html",
+            "https://www.tinnhanhchungkhoan.vn/a-post1.html",
+            "https://www.tinnhanhchungkhoan.vn/m-post2.html",
+        ])
+
+    def test_vneconomy_links_keep_card_order(self):
+        listing = _parse_html_bytes(b"""<div>
+            <div class="featured-row_item"><a href="/z.htm">z</a></div>
+            <div class="featured-column_item"><a href="/a.htm">a</a></div>
+            <div class="featured-row_item featured-column_item"><a href="/z.htm">z</a></div></div>""")
+        urls = VnEconomyHTMLParser()._resolve_article_urls(listing, "https://vneconomy.vn/chung-khoan.htm")
+        self.assertEqual(urls, ["https://vneconomy.vn/z.htm", "https://vneconomy.vn/a.htm"])
+
+
+class TNCKContentTest(unittest.TestCase):
+    def test_content_html_excludes_tail_text(self):
+        (entry,) = StubTNCK().parse("https://www.tinnhanhchungkhoan.vn/chung-khoan/", FeedContext("TNCK", "tnck"))
+        self.assertEqual(entry.content_html, '<div class="article__body"><p>Nội dung</p></div>')
+        self.assertEqual(entry.content_text, "Nội dung")
+
+
+class CharsetTest(unittest.TestCase):
+    PAGE = "<html><body><p>Giá vàng</p></body></html>".encode("utf-8")
+
+    def test_unknown_header_charset_falls_back(self):
+        self.assertEqual(_parse_html_bytes(self.PAGE, "utf8mb4").findtext(".//p"), "Giá vàng")
+
+    def test_unknown_meta_charset_falls_back(self):
+        page = b'<meta charset="utf8mb4">' + self.PAGE
+        self.assertEqual(_parse_html_bytes(page).findtext(".//p"), "Giá vàng")
+
+    def test_known_charset_is_used(self):
+        page = "<html><body><p>Giá</p></body></html>".encode("cp1258")
+        self.assertEqual(_parse_html_bytes(page, "windows-1258").findtext(".//p"), "Giá")
+
+
+if __name__ == "__main__":
+    unittest.main()